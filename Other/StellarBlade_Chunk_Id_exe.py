@@ -1,20 +1,64 @@
 import os
 import logging
-import uuid
+import mmap
+import random
+import re
 import struct
 import sys
-from typing import List, Dict
+from typing import List, Dict, NamedTuple, Optional, Set
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Queue, freeze_support
+from logging.handlers import QueueHandler, QueueListener
+from collections import defaultdict
 from dataclasses import dataclass, field
-from ctypes import c_uint8, c_uint16, c_uint32, c_uint64
+from array import array
 import msvcrt  #
 
+_HEADER_S = struct.Struct("<16s BBH 9I Q 4I BBH I Q I I 5Q")
+_ENTRY_S = struct.Struct("<QHBB")
+_U64_S = struct.Struct("<Q")
+_OFFSET_LENGTH_S = struct.Struct(">QH")  # FIoOffsetAndLength: 5+5 bytes big-endian
+_U40_MASK = 0xFFFFFFFFFF
+_HEADER_SIZE = _HEADER_S.size  # 144
+_ENTRY_SIZE = _ENTRY_S.size  # 12
 
-@dataclass
+
+@dataclass(slots=True)
 class FGuid:
-    A: c_uint32 = field(default=c_uint32(0))
-    B: c_uint32 = field(default=c_uint32(0))
-    C: c_uint32 = field(default=c_uint32(0))
-    D: c_uint32 = field(default=c_uint32(0))
+    A: int = 0
+    B: int = 0
+    C: int = 0
+    D: int = 0
+
+
+class TocHeader(NamedTuple):
+    magic: bytes  # 16s
+    version: int  # B
+    reserved0: int  # B
+    reserved00: int  # H
+    TocHeaderSize: int  # I
+    TocEntryCount: int
+    TocCompressedBlockEntryCount: int
+    TocCompressedBlockEntrySize: int
+    CompressionMethodNameCount: int
+    CompressionMethodNameLength: int
+    CompressionBlockSize: int
+    DirectoryIndexSize: int
+    PartitionCount: int
+    FIoContainerId: int  # Q
+    EncryptionKeyGuid: FGuid  # 4I
+    ContainerFlags: int  # B
+    Reserved1: int  # B
+    Reserved2: int  # H
+    TocChunkPerfectHashSeedsCount: int  # I
+    PartitionSize: int  # Q
+    TocChunksWithoutPerfectHashCount: int  # I
+    Reserved3: int  # I
+    Reserved4: int  # Q
+    Reserved5: int
+    Reserved6: int
+    Reserved7: int
+    Reserved8: int
 
 
 @dataclass
@@ -22,7 +66,7 @@ class Container:
     name: str
     container_id: int = 0
     old_container_id: int = 0
-    package_ids: List[int] = field(default_factory=list)
+    package_ids: array = field(default_factory=lambda: array("Q"))
 
 
 class UTOCParser:
@@ -31,242 +75,283 @@ class UTOCParser:
     def __init__(self, logger):
         self._logger = logger
         self.reset_parser_state()
-        self.container_ids = []
-        self.package_ids: Dict[int, list] = {}
-        self.containers: Dict[str, Container] = {}
+        self.container_ids: Set[int] = set()
+        self.package_ids: Dict[int, Set[str]] = defaultdict(set)
         self.Force = False
 
     def reset_parser_state(self):
         """Reset parser state for new file/重置解析器状态，为解析新文件做准备"""
         self.header = None
-        self.offset_lengths = []
-        self.compressed_blocks = []
-        self.directory_index = b""
-        self.entry_metas = []
-        self.file_size = 0
         self.container = None
 
-    def generate_u64_id(self, ids: List[c_uint64]) -> c_uint64:
+    def generate_u64_id(self, ids: Set[int]) -> int:
         """Generate new 64-bit unsigned ID/生成一个新的64位无符号整数ID"""
         for _ in range(10):
-            candidate = uuid.uuid4().int & 0xFFFFFFFFFFFFFFFF
+            candidate = random.getrandbits(64)
             if candidate not in ids:
-                ids.append(c_uint64(candidate))
-                return c_uint64(candidate)
+                ids.add(candidate)
+                return candidate
         raise ValueError(
             "无法生成唯一的64位无符号整数ID/Failed to generate unique 64-bit unsigned ID"
         )
 
-    def find_and_replace_bytes(self, file_path, mappingId: Dict[int, int]):
+    def find_and_replace_bytes(self, file_path, mappingId: Dict[int, int], data=None):
         """
-        Search and replace bytes in file/在文件中搜索指定字节序列并替换，覆盖原文件
+        Search and replace bytes in place/在文件中搜索指定字节序列并原地替换
         :param file_path: File path/文件路径
+        :param data: Open writable mapping or None/已可写映射的文件内容，为None时自行映射
         """
+        # Nothing to replace: skip opening the file, an empty pattern matches everywhere
+        if not mappingId:
+            self._logger.info("未找到匹配字节序列/No matching byte sequence found")
+            return
+        if data is None:
+            with open(file_path, "r+b") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_WRITE
+            ) as data:
+                return self.find_and_replace_bytes(file_path, mappingId, data)
+
         replacements = 0
-        with open(file_path, "rb") as f:
-            data = bytearray(f.read())
-        for old, new in mappingId.items():
-            search_bytes = old.to_bytes(8, "little")
-            replace_bytes = new.to_bytes(8, "little")
-            offset = 0
-
-            while offset < len(data):
-                found = data.find(search_bytes, offset)
-                if found == -1:
-                    break
-                data[found : found + len(search_bytes)] = replace_bytes
-                replacements += 1
-                offset = found + len(search_bytes)
+        replace_map = {
+            old.to_bytes(8, "little"): new.to_bytes(8, "little")
+            for old, new in mappingId.items()
+        }
+        # Single scan with one alternation of all ids, patching matches in place
+        pattern = re.compile(b"|".join(map(re.escape, replace_map)))
+        for match in pattern.finditer(data):
+            data[match.start() : match.end()] = replace_map[match.group()]
+            replacements += 1
 
         if replacements > 0:
-            with open(file_path, "wb") as f:
-                f.write(data)
             self._logger.info(
-                f"成功替换 {replacements} 处匹配项/Successfully replaced {replacements} matches"
+                "成功替换 %d 处匹配项/Successfully replaced %d matches",
+                replacements,
+                replacements,
             )
         else:
             self._logger.info("未找到匹配字节序列/No matching byte sequence found")
 
-    def _parse_header(self, data, utoc_f) -> Dict[int, int]:
+    def plan_container_ids(self, utoc_files: List[str]) -> Dict[str, Optional[int]]:
+        """
+        Pre-assign IDs for conflicting containers/按顺序为冲突container预先分配新ID
+        :param utoc_files: UTOC file paths/utoc文件路径列表
+        :return: New ID per file or None/每个文件的新ID，无需修改时为None
+        """
+        planned = {}
+        for utoc_file in utoc_files:
+            planned[utoc_file] = None
+            try:
+                with open(utoc_file, "rb") as utoc_f:
+                    header_data = _HEADER_S.unpack(utoc_f.read(_HEADER_SIZE))
+            except (OSError, struct.error) as e:
+                self._logger.error(
+                    "读取文件头失败/Failed to read header: %s - %s", utoc_file, e
+                )
+                continue
+            container_id = header_data[13]
+            if container_id in self.container_ids or self.Force:
+                planned[utoc_file] = self.generate_u64_id(self.container_ids)
+            else:
+                self.container_ids.add(container_id)
+        return planned
+
+    def _parse_header(
+        self, data, new_container_id: Optional[int] = None
+    ) -> Dict[int, int]:
         """Parse UTOC header/解析utoc文件头"""
-        header_format = "<16s BBH 9I Q 4I BBH I Q I I 5Q"
-        header_size = struct.calcsize(header_format)
-        header_data = struct.unpack(header_format, data[:header_size])
-        encryption_guid = FGuid(
-            A=c_uint32(header_data[14]),
-            B=c_uint32(header_data[15]),
-            C=c_uint32(header_data[16]),
-            D=c_uint32(header_data[17]),
+        header_data = _HEADER_S.unpack_from(data, 0)
+        encryption_guid = FGuid(*header_data[14:18])
+        self.header = TocHeader._make(
+            header_data[:14] + (encryption_guid,) + header_data[18:]
         )
-        self.header = {
-            "magic": header_data[0],  # 16s
-            "version": header_data[1],  # B
-            "reserved0": header_data[2],  # B
-            "reserved00": header_data[3],  # H
-            "TocHeaderSize": header_data[4],  # I
-            "TocEntryCount": header_data[5],
-            "TocCompressedBlockEntryCount": header_data[6],
-            "TocCompressedBlockEntrySize": header_data[7],
-            "CompressionMethodNameCount": header_data[8],
-            "CompressionMethodNameLength": header_data[9],
-            "CompressionBlockSize": header_data[10],
-            "DirectoryIndexSize": header_data[11],
-            "PartitionCount": header_data[12],
-            "FIoContainerId": header_data[13],  # Q
-            "EncryptionKeyGuid": encryption_guid,  # 4I
-            "ContainerFlags": header_data[18],  # B
-            "Reserved1": header_data[19],  # B
-            "Reserved2": header_data[20],  # Q
-            "TocChunkPerfectHashSeedsCount": header_data[21],  # I
-            "PartitionSize": header_data[22],  # Q
-            "TocChunksWithoutPerfectHashCount": header_data[23],  # I
-            "Reserved3": header_data[24],  # I
-            "Reserved4": header_data[25],  # Q
-            "Reserved5": header_data[26],
-            "Reserved6": header_data[27],
-            "Reserved7": header_data[28],
-            "Reserved8": header_data[29],
-        }
 
         # Verify magic number
-        if self.header["magic"] != self.EXPECTED_MAGIC:
+        if self.header.magic != self.EXPECTED_MAGIC:
             raise ValueError(
                 f"无效的魔数/Invalid magic: {self.header.magic.hex()}, 期望/expected: {self.EXPECTED_MAGIC.hex()}"
             )
 
-        # Create new ID if needed
-        if self.header["FIoContainerId"] in self.container_ids or self.Force:
-            newContainerId = self.generate_u64_id(self.container_ids).value
-            utoc_f.seek(56)
-            utoc_f.write(struct.pack("<Q", newContainerId))
-
-            self.container.old_container_id = self.header["FIoContainerId"]
-            self.container.container_id = newContainerId
-
-            return {self.header["FIoContainerId"]: newContainerId}
+        # Create new ID if needed (unless pre-assigned by plan_container_ids)
+        if new_container_id is None and (
+            self.header.FIoContainerId in self.container_ids or self.Force
+        ):
+            new_container_id = self.generate_u64_id(self.container_ids)
+        if new_container_id is not None:
+            # Record ID, written by _patch_container_id
+            self.container.old_container_id = self.header.FIoContainerId
+            self.container.container_id = new_container_id
+
+            return {self.header.FIoContainerId: new_container_id}
         else:
-            self.container_ids.append(self.header["FIoContainerId"])
-            self.container.container_id = self.header["FIoContainerId"]
+            self.container_ids.add(self.header.FIoContainerId)
+            self.container.container_id = self.header.FIoContainerId
             return None
 
-    def _parse_package_ids(self, data):
+    def _find_container_entry(
+        self, data, toc_entry_count: int, container_id: int
+    ) -> int:
+        """Find container id entry index/查找container id条目的索引，未找到返回-1"""
+        toc_entry_start = _HEADER_SIZE
+        toc_entry_end = toc_entry_start + toc_entry_count * _ENTRY_SIZE
+        search_bytes = _U64_S.pack(container_id)
+        found = data.find(search_bytes, toc_entry_start, toc_entry_end)
+        while found != -1:
+            index, misaligned = divmod(found - toc_entry_start, _ENTRY_SIZE)
+            # ChunkType 10 为 ContainerHeader
+            if not misaligned and data[found + _ENTRY_SIZE - 1] == 10:
+                return index
+            found = data.find(search_bytes, found + 1, toc_entry_end)
+        return -1
+
+    def _parse_package_ids(self, data, offset: int = _HEADER_SIZE):
         """Parse package IDs in UTOC/解析utoc文件中的package ids"""
-        PackageId_format = "<QHBB"
-        PackageId_size = struct.calcsize(PackageId_format)
-        for i in range(self.header["TocEntryCount"]):
-            PackageId = struct.unpack(PackageId_format, data[:PackageId_size])
-            ChunkId = PackageId[0]
-            ChunkType = PackageId[3]
-            data = data[PackageId_size:]
-            self.container.package_ids.append(ChunkId)
-            if ChunkId not in self.package_ids:
-                self.package_ids[ChunkId] = []
-            if self.container.name not in self.package_ids[ChunkId]:
-                self.package_ids[ChunkId].append(self.container.name)
+        # Entry = 8-byte ChunkId + 4 bytes of other fields, unpack all ids at once
+        chunk_ids = struct.unpack_from(
+            "<" + "Q4x" * self.header.TocEntryCount, data, offset
+        )
+        self.container.package_ids.extend(chunk_ids)
+        name = self.container.name
+        for ChunkId in chunk_ids:
+            self.package_ids[ChunkId].add(name)
         return None
 
-    def parse_utoc(self, utoc_file: str):
-        """Parse a single UTOC file/解析单个utoc文件"""
+    def _patch_container_id(self, file_data, base_name: str, ucas_file: str) -> bool:
+        """
+        Write new container ID into UTOC and UCAS/将新的container ID写入utoc及对应ucas
+        :return: False if entry not found/未找到条目返回False
+        """
+        toc_entry_count = self.header.TocEntryCount
+        compression_block_size = self.header.CompressionBlockSize
+        old_container_id = self.container.old_container_id
+        container_id = self.container.container_id
+        toc_entry_start = _HEADER_SIZE
+        entry_size = _ENTRY_SIZE
+
+        # Search for matching ID entry
+        index = self._find_container_entry(file_data, toc_entry_count, old_container_id)
+        if index == -1:
+            self._logger.error(
+                "未找到container_id/Container ID not found: %s", base_name
+            )
+            return False
+
+        # Write new ID into header
+        _U64_S.pack_into(file_data, 56, container_id)
+
+        # Update container ID in UTOC
+        _U64_S.pack_into(
+            file_data,
+            toc_entry_start + index * entry_size,
+            container_id,
+        )
+
+        # Calculate data block positions
+        toc_chunk_start = toc_entry_start + toc_entry_count * entry_size
+        chunk_entry_pos = toc_chunk_start + index * 10
+
+        # Read chunk info: 5-byte big-endian offset/length, split from one 10-byte read
+        high, low = _OFFSET_LENGTH_S.unpack_from(file_data, chunk_entry_pos)
+        offset_val = high >> 24
+        length_val = (high & 0xFFFFFF) << 16 | low
+
+        # Calculate compressed block indices
+        first_block_idx = offset_val // compression_block_size
+        last_block_idx = (
+            offset_val + length_val + compression_block_size - 1
+        ) // compression_block_size - 1
+
+        # Get compressed block info
+        compression_block_start = toc_chunk_start + toc_entry_count * 10
+        block_entry_pos = compression_block_start + first_block_idx * 12
+        block_offset = _U64_S.unpack_from(file_data, block_entry_pos)[0] & _U40_MASK
+
+        # Update container ID in UCAS file
+        with open(ucas_file, "r+b") as ucas_f, mmap.mmap(
+            ucas_f.fileno(), 0, access=mmap.ACCESS_WRITE
+        ) as ucas_data:
+            self._logger.debug(
+                "更新ucas容器ID/Updating UCAS container ID: %d", container_id
+            )
+            # Container ID is little-endian, same as in the UTOC
+            read_container_id = _U64_S.unpack_from(ucas_data, block_offset)[0]
+            if read_container_id == old_container_id:
+                _U64_S.pack_into(ucas_data, block_offset, container_id)
+            # Replace remaining occurrences within the same mapping/在同一映射中替换其余位置的旧ID
+            self.find_and_replace_bytes(
+                ucas_file,
+                {old_container_id: container_id},
+                ucas_data,
+            )
+        return True
+
+    def parse_utoc(self, utoc_file: str, new_container_id: Optional[int] = None):
+        """
+        Parse a single UTOC file/解析单个utoc文件
+        :param utoc_file: UTOC file path/utoc文件路径
+        :param new_container_id: Pre-assigned container ID/预先分配的container ID
+        """
         self.reset_parser_state()
-        base_name = os.path.basename(utoc_file)
-        if not base_name.endswith(".utoc"):
+        if not utoc_file.endswith(".utoc"):
             return None, self.package_ids
 
-        ucas_file = utoc_file.replace(".utoc", ".ucas")
-        self._logger.debug(f"开始解析文件/Starting parsing file: {base_name}")
+        base_name = os.path.basename(utoc_file)
+        ucas_file = utoc_file[: -len(".utoc")] + ".ucas"
+        self._logger.debug("开始解析文件/Starting parsing file: %s", base_name)
         self.container = Container(base_name.split(".")[0])
         try:
-            with open(utoc_file, "r+b") as utoc_f:
-                file_data = utoc_f.read()
-                self.file_size = len(file_data)
-
+            # Read-only mapping, map writable only when the container ID changes
+            with open(utoc_file, "rb") as utoc_f, mmap.mmap(
+                utoc_f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as file_data:
                 # Parse header
-                changed_container_id = self._parse_header(file_data, utoc_f)
-                toc_entry_count = self.header["TocEntryCount"]
-                compression_block_size = self.header["CompressionBlockSize"]
-
-                # Handle container ID modification
-                if changed_container_id:
-                    found = False
-                    toc_entry_start = 144
-                    entry_size = 12
-
-                    # Search for matching ID entry
-                    for index in range(toc_entry_count):
-                        entry_pos = toc_entry_start + index * entry_size
-                        id_bytes = file_data[entry_pos : entry_pos + entry_size]
-                        id_val, reverse1, reverse2, idtype = struct.unpack(
-                            "<QHBB", id_bytes
-                        )
-
-                        if id_val == self.container.old_container_id and idtype == 10:
-                            # Update container ID in UTOC
-                            utoc_f.seek(entry_pos)
-                            utoc_f.write(struct.pack("<Q", self.container.container_id))
-                            found = True
-                            break
-
-                    if not found:
-                        self._logger.error(
-                            f"未找到container_id/Container ID not found: {base_name}"
-                        )
+                changed_container_id = self._parse_header(file_data, new_container_id)
+                if not changed_container_id:
+                    # Parse package IDs
+                    self._parse_package_ids(file_data)
+
+            # Handle container ID modification
+            if changed_container_id:
+                with open(utoc_file, "r+b") as utoc_f, mmap.mmap(
+                    utoc_f.fileno(), 0, access=mmap.ACCESS_WRITE
+                ) as mapped_data:
+                    if not self._patch_container_id(mapped_data, base_name, ucas_file):
                         return None, self.package_ids
-
-                    # Calculate data block positions
-                    toc_chunk_start = toc_entry_start + toc_entry_count * entry_size
-                    chunk_entry_pos = toc_chunk_start + index * 10
-
-                    # Read chunk information
-                    offset_bytes = file_data[chunk_entry_pos : chunk_entry_pos + 5]
-                    length_bytes = file_data[chunk_entry_pos + 5 : chunk_entry_pos + 10]
-                    offset_val = int.from_bytes(offset_bytes, byteorder="big")
-                    length_val = int.from_bytes(length_bytes, byteorder="big")
-
-                    # Calculate compressed block indices
-                    first_block_idx = offset_val // compression_block_size
-                    last_block_idx = (
-                        offset_val + length_val + compression_block_size - 1
-                    ) // compression_block_size - 1
-
-                    # Get compressed block info
-                    compression_block_start = toc_chunk_start + toc_entry_count * 10
-                    block_entry_pos = compression_block_start + first_block_idx * 12
-                    block_offset = int.from_bytes(
-                        file_data[block_entry_pos : block_entry_pos + 5], "little"
-                    )
-
-                    # Update container ID in UCAS file
-                    with open(ucas_file, "r+b") as ucas_f:
-                        self._logger.debug(
-                            f"更新ucas容器ID/Updating UCAS container ID: {self.container.container_id}"
-                        )
-                        ucas_data = ucas_f.read()
-                        read_container_id = int.from_bytes(
-                            ucas_data[block_offset : block_offset + 8]
-                        )
-                        if read_container_id == self.container.old_container_id:
-                            ucas_f.seek(block_offset)
-                            ucas_f.write(struct.pack("<Q", self.container.container_id))
-                    self.find_and_replace_bytes(
-                        ucas_file,
-                        {self.container.old_container_id: self.container.container_id},
-                    )
-
-                # Parse package IDs
-                self._parse_package_ids(file_data[144:])
+                    # Parse package IDs
+                    self._parse_package_ids(mapped_data)
         except Exception as e:
-            self._logger.error(f"解析失败/Parsing failed: {base_name} - {str(e)}")
+            self._logger.error("解析失败/Parsing failed: %s - %s", base_name, e)
             return False
 
         if changed_container_id or self.Force:
-            msg = f"{self.container.name} {self.container.old_container_id}->{self.container.container_id}"
-            self._logger.debug(f"处理完成/Processing completed: {msg}")
+            self._logger.debug(
+                "处理完成/Processing completed: %s %d->%d",
+                self.container.name,
+                self.container.old_container_id,
+                self.container.container_id,
+            )
             return self.container, self.package_ids
 
-        self._logger.debug(f"无需处理/No processing needed: {base_name}")
+        self._logger.debug("无需处理/No processing needed: %s", base_name)
         return None, self.package_ids
 
 
+def parse_utoc_worker(utoc_file: str, new_container_id: Optional[int]):
+    """Parse one UTOC in a worker process/在子进程中解析单个utoc文件"""
+    parser = UTOCParser(logging.getLogger("StellarBlade_Chunk_Id_Patcher"))
+    result = parser.parse_utoc(utoc_file, new_container_id)
+    container = result[0] if result else None
+    return container, parser.package_ids
+
+
+def init_worker_logger(log_queue: Queue):
+    """Worker logging via the parent/子进程日志经队列交给主进程统一写入"""
+    logger = logging.getLogger("StellarBlade_Chunk_Id_Patcher")
+    logger.setLevel(logging.DEBUG)
+    # 多个进程同时追加同一日志文件会交错，fork 继承的处理器一并移除
+    logger.handlers.clear()
+    logger.addHandler(QueueHandler(log_queue))
+
+
 def setup_logger():
     """配置日志记录器"""
     logger = logging.getLogger("StellarBlade_Chunk_Id_Patcher")
@@ -297,12 +382,18 @@ def setup_logger():
 
 def find_utoc_files(root_dir):
     """查找所有utoc文件"""
-    utoc_files = []
-    for root, _, files in os.walk(root_dir):
-        for file in files:
-            if file.endswith(".utoc"):
-                utoc_files.append(os.path.join(root, file))
-    return utoc_files
+    subdirs = []
+    try:
+        with os.scandir(root_dir) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(".utoc"):
+                    yield entry.path
+    except OSError:
+        return
+    for subdir in subdirs:
+        yield from find_utoc_files(subdir)
 
 
 def main():
@@ -312,11 +403,11 @@ def main():
 
     # 获取当前工作目录
     current_dir = os.getcwd()
-    logger.info(f"工作目录: {current_dir}")
+    logger.info("工作目录: %s", current_dir)
 
     # 查找所有utoc文件
-    utoc_files = find_utoc_files(current_dir)
-    logger.info(f"找到 {len(utoc_files)} 个 .utoc 文件")
+    utoc_files = list(find_utoc_files(current_dir))
+    logger.info("找到 %d 个 .utoc 文件", len(utoc_files))
 
     if not utoc_files:
         logger.warning("未找到任何.utoc文件，程序退出\n find no utoc file")
@@ -326,27 +417,53 @@ def main():
     # 解析utoc文件
     parser = UTOCParser(logger)
     containers = {}
-    packageid_conflicts = []
-
-    for file_path in utoc_files:
-        container, packageids = parser.parse_utoc(file_path)
-        if container:
-            containers[container.name] = container
+    packageids: Dict[int, Set[str]] = defaultdict(set)
+
+    # 先按顺序分配新ID，再并行处理各文件
+    planned = parser.plan_container_ids(utoc_files)
+    # 按文件数和进程数划分任务块，文件较少时每个进程也能分到任务
+    # Windows 下 ProcessPoolExecutor 最多 61 个进程
+    workers = min(len(utoc_files), os.cpu_count() or 1, 61)
+    chunksize = max(1, len(utoc_files) // (workers * 4))
+    log_queue = Queue()
+    listener = QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    listener.start()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker_logger,
+            initargs=(log_queue,),
+        ) as executor:
+            results = executor.map(
+                parse_utoc_worker,
+                utoc_files,
+                [planned[file_path] for file_path in utoc_files],
+                chunksize=chunksize,
+            )
+            for container, file_package_ids in results:
+                if container:
+                    containers[container.name] = container
+                for k, names in file_package_ids.items():
+                    packageids[k].update(names)
+    finally:
+        listener.stop()
 
-        # 检查package ID冲突
     for k, v in containers.items():
-        self.num = self.num + 1
-        logger.info(f"{k}:{v.old_container_id}->{v.container_id}")
+        logger.info("%s:%d->%d", k, v.old_container_id, v.container_id)
+
+    # 检查package ID冲突
     for k, v in packageids.items():
         if len(v) > 1:
-            logger.warning(f"警告！修改相同资源\n the same packageid \n {k} :\n{v}")
+            logger.warning(
+                "警告！修改相同资源\n the same packageid \n %d :\n%s", k, sorted(v)
+            )
 
     # 输出结果摘要
     logger.info("\n=== 处理结果摘要/Summary ===")
-    logger.info(f"总共找到 {len(utoc_files)} 个Mod")
-    logger.info(f"find  {len(utoc_files)} Mod")
-    logger.info(f"成功处理 {len(containers)} 个 ContainerId 冲突")
-    logger.info(f"fix {len(containers)}  ContainerId conflict mod")
+    logger.info("总共找到 %d 个Mod", len(utoc_files))
+    logger.info("find  %d Mod", len(utoc_files))
+    logger.info("成功处理 %d 个 ContainerId 冲突", len(containers))
+    logger.info("fix %d  ContainerId conflict mod", len(containers))
     wait_for_key()
 
 
@@ -358,4 +475,5 @@ def wait_for_key():
 
 
 if __name__ == "__main__":
+    freeze_support()
     main()
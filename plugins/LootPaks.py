@@ -3,24 +3,25 @@ import os
 import logging
 import uuid
 import re
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Iterator, Tuple
 from pathlib import Path
 from PyQt6.QtCore import QDir
 from PyQt6.QtGui import QIcon
 from PyQt6.QtWidgets import QMainWindow, QWidget, QMessageBox
 
+_FILE_PATTERN = re.compile(r"re_chunk_000\.pak\.sub_000\.pak\.patch_(\d{3})\.pak")
+
 
 class LootPaks(mobase.IPluginTool):
     _organizer: mobase.IOrganizer
     _mainWindow: QMainWindow
     _parentWidget: QWidget
+    _PAK_PREFIX = "re_chunk_000.pak.sub_000.pak.patch_"
 
     def __init__(self):
         super().__init__()
         self._init_logger()
-        self._file_pattern = re.compile(
-            r"re_chunk_000\.pak\.sub_000\.pak\.patch_(\d{3})\.pak"
-        )
 
     def _init_logger(self) -> None:
         """初始化日志记录器"""
@@ -76,22 +77,37 @@ class LootPaks(mobase.IPluginTool):
         mod_state = self._organizer.modList().state(mod)
         return mod_state & mobase.ModState.ACTIVE.value
 
-    def _handle_single_mod(self, mod_path: str, start_number: int) -> int:
-        """处理单个模组返回新的起始编号"""
-        if not mod_path.is_dir():
-            self._logger.warning(f"Invalid mod path: {mod_path}")
-            return start_number
-
-        return self.processPakFiles(str(mod_path), start_number)
+    def _collect_mod_paks(self, mod_parent: str) -> List[Tuple[str, List[Path]]]:
+        """按优先级顺序收集所有启用模组根目录中的 .pak 文件"""
+        mod_paks = []
+        for mod in self._organizer.modList().allModsByProfilePriority():
+            if not self._should_process_mod(mod):
+                continue
+            mod_path = os.path.join(mod_parent, mod)
+            if not os.path.isdir(mod_path):
+                self._logger.warning(f"Invalid mod path: {mod_path}")
+                continue
+            mod_paks.append((mod, self._list_pak_files(mod_path)))
+        return mod_paks
 
-    def _create_temp_mapping(self, mod_path: Path) -> Dict[Path, Path]:
-        """创建临时文件映射，仅处理根目录中的 .pak 文件"""
-        temp_map = {}
-        if (mod_path / ".NotLOOT").exists():
+    def _list_pak_files(self, mod_path: str) -> List[Path]:
+        """按名称顺序列出模组根目录中的 .pak 文件，存在 .NotLOOT 时返回空列表"""
+        if os.path.lexists(os.path.join(mod_path, ".NotLOOT")):
             self._logger.info(f"Skipped folder due to .NotLOOT file: {mod_path}")
-            return {}
-        for pak_file in mod_path.glob("*.pak"):  # 修改为 glob 以仅匹配根目录
-
+            return []
+        # 仅扫描根目录，直接使用 DirEntry 的名称与类型信息过滤
+        with os.scandir(mod_path) as it:
+            pak_paths = sorted(
+                entry.path
+                for entry in it
+                if entry.name.lower().endswith(".pak") and entry.is_file()
+            )
+        return [Path(p) for p in pak_paths]
+
+    def _create_temp_mapping(self, pak_files: List[Path]) -> Dict[Path, Path]:
+        """将 .pak 文件重命名为临时名称，返回按原顺序排列的临时文件映射"""
+        temp_map = {}
+        for pak_file in pak_files:
             temp_name = f"{uuid.uuid4().hex}.pak"
             temp_path = pak_file.with_name(temp_name)
             if self._safe_rename(pak_file, temp_path):
@@ -114,27 +130,58 @@ class LootPaks(mobase.IPluginTool):
             self._logger.error(f"Rename failed: {src} -> {dst} | Error: {e}")
             return False
 
+    @staticmethod
+    def _iter_file_names(root: str) -> Iterator[str]:
+        """基于 os.scandir 的栈式遍历，逐个产出目录树中的文件名"""
+        stack = [root]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            yield entry.name
+            except OSError:
+                # 与 os.walk 默认行为一致：跳过无法访问的目录
+                continue
+
+    def _iter_patch_numbers(self, root: str) -> Iterator[int]:
+        """产出目录树中所有补丁 .pak 文件的编号"""
+        prefix = self._PAK_PREFIX
+        for file in self._iter_file_names(root):
+            # 先用廉价的前后缀判断过滤绝大多数无关文件，再交给正则
+            if not (file.endswith(".pak") and file.startswith(prefix)):
+                continue
+            match = _FILE_PATTERN.fullmatch(file)
+            if match:
+                yield int(match.group(1))
+
     def findStartNumber(self, gamePath: str) -> int:
         """使用正则表达式优化查找起始编号"""
-        max_number = 0
-        for root, _, files in os.walk(gamePath):
-            for file in files:
-                match = self._file_pattern.fullmatch(file)
-                if match:
-                    current_num = int(match.group(1))
-                    max_number = max(max_number, current_num)
-        return max_number + 1
+        return max(self._iter_patch_numbers(gamePath), default=0) + 1
 
     def processPakFiles(self, modPath: str, startNumber: int) -> int:
         """优化后的文件处理方法"""
-        mod_path = Path(modPath)
-        temp_map = self._create_temp_mapping(mod_path)
+        return self._rename_pak_files(self._list_pak_files(modPath), startNumber)
+
+    def _rename_pak_files(self, pak_files: List[Path], startNumber: int) -> int:
+        """从起始编号开始依次重命名给定的 .pak 文件，返回下一个可用编号"""
+        # 仅当现有文件名与目标编号区间冲突时才需要经过临时名称中转
+        end_number = startNumber + len(pak_files)
+        target_names = {
+            f"{self._PAK_PREFIX}{n:03d}.pak" for n in range(startNumber, end_number)
+        }
+        if any(p.name.lower() in target_names for p in pak_files):
+            sources = list(self._create_temp_mapping(pak_files))
+        else:
+            sources = pak_files
 
         current_number = startNumber
-        for temp_path in sorted(temp_map.keys()):
-            target_name = f"re_chunk_000.pak.sub_000.pak.patch_{current_number:03d}.pak"
-            target_path = temp_path.with_name(target_name)
-            if self._safe_rename(temp_path, target_path):
+        for src_path in sources:
+            target_name = f"{self._PAK_PREFIX}{current_number:03d}.pak"
+            target_path = src_path.with_name(target_name)
+            if self._safe_rename(src_path, target_path):
                 self._logger.info(f"Renamed: {target_name}")
                 current_number += 1
         # if current_number == startNumber:
@@ -146,15 +193,16 @@ class LootPaks(mobase.IPluginTool):
         mod_parent, game_path = self._get_mod_paths()
         self._logger.info(f"Mod parent: {mod_parent}")
         self._logger.info(f"Game path: {game_path}")
-        initial_number = self.findStartNumber(game_path)
+        # 游戏目录扫描与模组 .pak 枚举互不依赖，扫描放到后台线程与枚举重叠进行
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            start_future = executor.submit(self.findStartNumber, game_path)
+            mod_paks = self._collect_mod_paks(mod_parent)
+            initial_number = start_future.result()
         self._logger.info(f"Initial Pak number: {initial_number}")
         final_number = initial_number
-        for mod in self._organizer.modList().allModsByProfilePriority():
-            if not self._should_process_mod(mod):
-                continue
+        for mod, pak_files in mod_paks:
             self._logger.info(f"Processing mod: {mod}")
-            mod_path = Path(mod_parent) / mod
-            final_number = self._handle_single_mod(mod_path, final_number)
+            final_number = self._rename_pak_files(pak_files, final_number)
 
         processed_count = final_number - initial_number
         self._show_completion_dialog(processed_count)
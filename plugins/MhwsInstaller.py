@@ -3,7 +3,8 @@ from __future__ import annotations
 import re
 import logging
 from collections import defaultdict
-from typing import Dict, List, Optional, Union, cast
+from operator import attrgetter
+from typing import Callable, List, Optional, Union, cast
 from dataclasses import dataclass
 
 from PyQt6 import QtWidgets, QtGui, QtCore
@@ -11,6 +12,17 @@ from PyQt6.QtWidgets import QApplication
 
 import mobase
 
+# modinfo.ini 中的 key=value 行，跳过以 # 或 ; 开头的注释行
+_MODINFO_RE = re.compile(
+    r"^[^\S\n]*([^=\s#;][^=\n]*?)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$", re.M
+)
+
+# 预览图与安装后需清理的根目录文件后缀
+_PREVIEW_EXTS = frozenset({"jpg", "jpeg", "png"})
+_JUNK_EXTS = frozenset({"ini", "jpg", "png"})
+# 预览图解码的最大边长，超出时在解码阶段按比例缩小
+_PREVIEW_MAX_SIZE = 2048
+
 
 @dataclass
 class GroupOption:
@@ -19,7 +31,7 @@ class GroupOption:
     unique_name: str
     display_name: str
     description: str
-    preview: Optional[QtGui.QPixmap] = None
+    preview: Union[QtGui.QPixmap, Callable[[], Optional[QtGui.QPixmap]], None] = None
 
 
 @dataclass
@@ -46,18 +58,21 @@ class ModOptionsDialog(QtWidgets.QDialog):
         :param preselect: 预设选中的选项唯一名称列表
         """
         super().__init__(parent)
+        self._tr_cache: dict[str, str] = {}
         self._selected_options: list[str] = []
         self.groups = groups
-        self.preselect = preselect or []
+        self.preselect = frozenset(preselect or ())
         self.current_group_index = 0
 
-        # 创建选项映射关系
-        self.preview_map = {}
-        self.modinfo_map = {}
-        for group in groups:
-            for option in group.options:
-                self.preview_map[option.unique_name] = option.preview
-                self.modinfo_map[option.unique_name] = option.description
+        # 创建选项唯一名称到选项的映射关系
+        self.option_map: dict[str, GroupOption] = {
+            option.unique_name: option for group in groups for option in group.options
+        }
+        # 已勾选选项及其显示顺序；未构建的分组页面也通过预选状态参与统计
+        self._option_order: dict[str, int] = {
+            name: index for index, name in enumerate(self.option_map)
+        }
+        self._checked: set[str] = self.preselect & self.option_map.keys()
 
         self.setup_ui()
 
@@ -80,8 +95,9 @@ class ModOptionsDialog(QtWidgets.QDialog):
         main_layout.addWidget(splitter)
 
         self.update_buttons()
-        if self.list_widgets:
-            self.list_widgets[0].setCurrentRow(0)
+        if self.groups:
+            self._ensure_page(0).setCurrentRow(0)
+            self.stacked_widget.setCurrentIndex(0)
             self.update_preview()
 
     def _setup_graphics_view(self, splitter: QtWidgets.QSplitter):
@@ -109,6 +125,31 @@ class ModOptionsDialog(QtWidgets.QDialog):
 
         self.scene = QtWidgets.QGraphicsScene()
         self.graphics_view.setScene(self.scene)
+        self.graphics_view.setCacheMode(
+            QtWidgets.QGraphicsView.CacheModeFlag.CacheBackground
+        )
+        self.graphics_view.setViewportUpdateMode(
+            QtWidgets.QGraphicsView.ViewportUpdateMode.SmartViewportUpdate
+        )
+
+        # 预览图与占位文字各保留一个常驻图元，切换选项时只更新内容和可见性
+        self._pixmap_item = QtWidgets.QGraphicsPixmapItem()
+        self._pixmap_item.setTransformationMode(
+            QtCore.Qt.TransformationMode.SmoothTransformation
+        )
+        # 按设备坐标缓存平滑缩放后的图像，拖动平移时无需重新缩放原图
+        self._pixmap_item.setCacheMode(
+            QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache
+        )
+        self._pixmap_item.setVisible(False)
+        self.scene.addItem(self._pixmap_item)
+        self._text_item = self.scene.addText(self.tr("无可用预览"))
+        self._text_item.setDefaultTextColor(QtGui.QColor("#FFFFFF"))
+        self._text_item.setPos(
+            -self._text_item.boundingRect().width() / 2,
+            -self._text_item.boundingRect().height() / 2,
+        )
+        self._text_item.setVisible(False)
         self.graphics_view.setStyleSheet("border: 1px solid #444; background: #2A2A2A;")
         self.graphics_view.setMinimumSize(600, 600)
         splitter.addWidget(self.graphics_view)
@@ -133,28 +174,46 @@ class ModOptionsDialog(QtWidgets.QDialog):
         self.stacked_widget = QtWidgets.QStackedWidget()
         layout.addWidget(self.stacked_widget, stretch=6)
 
-        self.list_widgets = []
-        for group in self.groups:
-            page_widget = QtWidgets.QWidget()
-            page_layout = QtWidgets.QVBoxLayout(page_widget)
+        # 各分组先放入占位页面，首次切换到该分组时再构建选项列表
+        self.list_widgets: list[Optional[QtWidgets.QListWidget]] = []
+        for _ in self.groups:
+            self.list_widgets.append(None)
+            self.stacked_widget.addWidget(QtWidgets.QWidget())
+
+    def _ensure_page(self, index: int) -> QtWidgets.QListWidget:
+        """构建指定分组的选项列表页面（若尚未构建），返回其列表部件"""
+        list_widget = self.list_widgets[index]
+        if list_widget is not None:
+            return list_widget
 
-            list_widget = QtWidgets.QListWidget()
-            list_widget.setSelectionMode(
-                QtWidgets.QAbstractItemView.SelectionMode.SingleSelection
+        page_widget = QtWidgets.QWidget()
+        page_layout = QtWidgets.QVBoxLayout(page_widget)
+
+        list_widget = QtWidgets.QListWidget()
+        list_widget.setSelectionMode(
+            QtWidgets.QAbstractItemView.SelectionMode.SingleSelection
+        )
+        # 所有选项行高一致，让 Qt 跳过逐项的尺寸计算
+        list_widget.setUniformItemSizes(True)
+        for option in self.groups[index].options:
+            item = QtWidgets.QListWidgetItem(option.display_name)
+            item.setData(QtCore.Qt.ItemDataRole.UserRole, option.unique_name)
+            item.setCheckState(
+                QtCore.Qt.CheckState.Checked
+                if option.unique_name in self._checked
+                else QtCore.Qt.CheckState.Unchecked
             )
-            for option in group.options:
-                item = QtWidgets.QListWidgetItem(option.display_name)
-                item.setData(QtCore.Qt.ItemDataRole.UserRole, option.unique_name)
-                item.setCheckState(
-                    QtCore.Qt.CheckState.Checked
-                    if option.unique_name in self.preselect
-                    else QtCore.Qt.CheckState.Unchecked
-                )
-                list_widget.addItem(item)
-            list_widget.itemSelectionChanged.connect(self.update_preview)
-            self.list_widgets.append(list_widget)
-            page_layout.addWidget(list_widget)
-            self.stacked_widget.addWidget(page_widget)
+            list_widget.addItem(item)
+        list_widget.itemSelectionChanged.connect(self.update_preview)
+        list_widget.itemChanged.connect(self._on_item_changed)
+        page_layout.addWidget(list_widget)
+
+        placeholder = self.stacked_widget.widget(index)
+        self.stacked_widget.insertWidget(index, page_widget)
+        self.stacked_widget.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.list_widgets[index] = list_widget
+        return list_widget
 
     def _setup_buttons(self, layout: QtWidgets.QVBoxLayout):
         """初始化底部操作按钮"""
@@ -172,7 +231,7 @@ class ModOptionsDialog(QtWidgets.QDialog):
         button_layout.addWidget(self.prev_btn)
 
         self.next_btn = QtWidgets.QPushButton(self.tr("Next"))
-        self.next_btn.clicked.connect(self.next_group)
+        self.next_btn.clicked.connect(self._on_next_clicked)
         button_layout.addWidget(self.next_btn)
 
         self.cancel_btn = QtWidgets.QPushButton(self.tr("Cancel"))
@@ -205,30 +264,41 @@ class ModOptionsDialog(QtWidgets.QDialog):
             view_rect = self.graphics_view.mapToScene(
                 self.graphics_view.viewport().rect()
             ).boundingRect()
-            image_rect = self.scene.itemsBoundingRect()
+            image_rect = self._visible_preview_rect()
             if view_rect.contains(image_rect):
                 self.graphics_view.centerOn(image_rect.center())
 
+    def _on_item_changed(self, item: QtWidgets.QListWidgetItem):
+        """同步选项勾选状态到已选集合"""
+        unique_name = item.data(QtCore.Qt.ItemDataRole.UserRole)
+        if item.checkState() == QtCore.Qt.CheckState.Checked:
+            self._checked.add(unique_name)
+        else:
+            self._checked.discard(unique_name)
+
     def update_buttons(self):
         """更新导航按钮状态"""
         self.prev_btn.setEnabled(self.current_group_index > 0)
         if self.current_group_index == len(self.groups) - 1:
             self.next_btn.setText(self.tr("Finish"))
-            self.next_btn.clicked.disconnect()
-            self.next_btn.clicked.connect(self.accept)
         else:
             self.next_btn.setText(self.tr("Next"))
-            self.next_btn.clicked.disconnect()
-            self.next_btn.clicked.connect(self.next_group)
         self.title_label.setText(self.groups[self.current_group_index].name)
 
+    def _on_next_clicked(self):
+        """下一步按钮：最后一个分组时完成选择，否则切换到下一个分组"""
+        if self.current_group_index == len(self.groups) - 1:
+            self.accept()
+        else:
+            self.next_group()
+
     def next_group(self):
         """切换到下一个选项分组"""
         if self.current_group_index < len(self.groups) - 1:
             self.current_group_index += 1
+            current_list = self._ensure_page(self.current_group_index)
             self.stacked_widget.setCurrentIndex(self.current_group_index)
             self.update_buttons()
-            current_list = self.list_widgets[self.current_group_index]
             if current_list.count() > 0:
                 current_list.setCurrentRow(0)
 
@@ -236,9 +306,9 @@ class ModOptionsDialog(QtWidgets.QDialog):
         """切换到上一个选项分组"""
         if self.current_group_index > 0:
             self.current_group_index -= 1
+            current_list = self._ensure_page(self.current_group_index)
             self.stacked_widget.setCurrentIndex(self.current_group_index)
             self.update_buttons()
-            current_list = self.list_widgets[self.current_group_index]
             if current_list.count() > 0:
                 current_list.setCurrentRow(0)
 
@@ -265,70 +335,73 @@ class ModOptionsDialog(QtWidgets.QDialog):
         item = selected_items[0]
         unique_name = item.data(QtCore.Qt.ItemDataRole.UserRole)
 
-        self.scene.clear()
-        preview = self.preview_map.get(unique_name)
+        option = self.option_map.get(unique_name)
+        preview = option.preview if option else None
+        if callable(preview):
+            # 预览图延迟到首次查看时才解压加载，并缓存结果
+            preview = preview()
+            option.preview = preview
         if preview:
-            pixmap_item = QtWidgets.QGraphicsPixmapItem(preview)
-            pixmap_item.setTransformationMode(
-                QtCore.Qt.TransformationMode.SmoothTransformation
-            )
-            pixmap_item.setPos(-preview.width() / 2, -preview.height() / 2)
-            self.scene.addItem(pixmap_item)
+            self._pixmap_item.setPixmap(preview)
+            self._pixmap_item.setPos(-preview.width() / 2, -preview.height() / 2)
+            self._pixmap_item.setVisible(True)
+            self._text_item.setVisible(False)
             self.graphics_view.fitInView(
-                pixmap_item, QtCore.Qt.AspectRatioMode.KeepAspectRatio
+                self._pixmap_item, QtCore.Qt.AspectRatioMode.KeepAspectRatio
             )
         else:
-            text_item = self.scene.addText(self.tr("无可用预览"))
-            text_item.setDefaultTextColor(QtGui.QColor("#FFFFFF"))
-            text_item.setPos(
-                -text_item.boundingRect().width() / 2,
-                -text_item.boundingRect().height() / 2,
-            )
+            self._pixmap_item.setVisible(False)
+            self._pixmap_item.setPixmap(QtGui.QPixmap())
+            self._text_item.setVisible(True)
 
         self.modinfo_text.setPlainText(
-            self.modinfo_map.get(unique_name, self.tr("无modinfo信息"))
+            option.description if option else self.tr("无modinfo信息")
         )
 
     def resizeEvent(self, event: QtGui.QResizeEvent):
         """窗口大小变化事件处理"""
         super().resizeEvent(event)
-        if self.scene.items():
+        rect = self._visible_preview_rect()
+        if not rect.isNull():
             self.graphics_view.fitInView(
-                self.scene.itemsBoundingRect(),
+                rect,
                 QtCore.Qt.AspectRatioMode.KeepAspectRatio,
             )
 
+    def _visible_preview_rect(self) -> QtCore.QRectF:
+        """返回当前可见预览图元在场景中的范围，无可见图元时返回空矩形"""
+        for item in (self._pixmap_item, self._text_item):
+            if item.isVisible():
+                return item.sceneBoundingRect()
+        return QtCore.QRectF()
+
     def selected_options(self) -> list[str]:
-        """获取所有选中的选项唯一名称"""
-        selected = []
-        for list_widget in self.list_widgets:
-            for i in range(list_widget.count()):
-                item = list_widget.item(i)
-                if item.checkState() == QtCore.Qt.CheckState.Checked:
-                    selected.append(item.data(QtCore.Qt.ItemDataRole.UserRole))
-        return selected
+        """获取所有选中的选项唯一名称，按列表中的显示顺序返回"""
+        return sorted(self._checked, key=self._option_order.__getitem__)
 
     def tr(self, value: str) -> str:
-        """国际化翻译方法"""
-        return QApplication.translate("ModOptionsDialog", value)
+        """国际化翻译方法，缓存已翻译的字符串"""
+        text = self._tr_cache.get(value)
+        if text is None:
+            text = QApplication.translate("ModOptionsDialog", value)
+            self._tr_cache[value] = text
+        return text
 
 
 class MhwsInstaller(mobase.IPluginInstallerSimple):
     """MOD安装器核心类，实现MO2插件接口"""
 
-    RE_DESCRIPTION = re.compile(r"select([0-9]+)-description")
-    RE_OPTION = re.compile(r"select([0-9]+)-option([0-9]+)")
-
     _organizer: mobase.IOrganizer
-    _installerOptions: Dict[str, List[str]]
-    _installerUsed: bool
 
     def __init__(self):
         super().__init__()
         self._init_logger()
+        self._tr_cache: dict[str, str] = {}
+        self._preview_cache: dict[str, Optional[QtGui.QPixmap]] = {}
         self.current_mod = None
         self.new_mod = None
         self._pending_selected_options = None
+        self._base_cache: Optional[tuple[mobase.IFileTree, object]] = None
 
     def _init_logger(self) -> None:
         """初始化日志记录器"""
@@ -380,8 +453,8 @@ class MhwsInstaller(mobase.IPluginInstallerSimple):
         current_mod: Optional[mobase.IModInterface],
     ):
         """安装开始时的回调方法"""
-        self._installerUsed = False
-        self._installerOptions = {}
+        self._preview_cache.clear()
+        self._base_cache = None
         self.current_mod = current_mod
 
     def onInstallationEnd(
@@ -389,6 +462,7 @@ class MhwsInstaller(mobase.IPluginInstallerSimple):
     ):
         """安装结束时的回调方法"""
         self.new_mod = new_mod
+        self._base_cache = None
         if (
             result == mobase.InstallResult.SUCCESS
             and self._pending_selected_options is not None
@@ -402,91 +476,115 @@ class MhwsInstaller(mobase.IPluginInstallerSimple):
             )
             self._pending_selected_options = None
 
-        if (
-            result != mobase.InstallResult.SUCCESS
-            or not self._installerUsed
-            or not new_mod
-        ):
-            return
-
-        new_mod.clearPluginSettings(self.name())
-        for i, desc in enumerate(self._installerOptions):
-            new_mod.setPluginSetting(self.name(), f"select{i}-description", desc)
-            for iopt, opt in enumerate(self._installerOptions[desc]):
-                new_mod.setPluginSetting(self.name(), f"select{i}-option{iopt}", opt)
-
     def _getWizardArchiveBase(self, tree: mobase.IFileTree, data_name: str) -> Union[
-        tuple[mobase.IFileTree, Optional[QtGui.QPixmap], dict],
-        List[tuple[mobase.IFileTree, Optional[QtGui.QPixmap], dict]],
+        tuple[mobase.IFileTree, Callable[[], Optional[QtGui.QPixmap]], dict],
+        List[tuple[mobase.IFileTree, Callable[[], Optional[QtGui.QPixmap]], dict]],
         None,
     ]:
         """解析压缩包结构并获取有效选项数据"""
 
-        def read_modinfo(entry: mobase.IFileTree) -> dict:
-            """读取modinfo配置文件"""
-            modinfo_entry = entry.find("modinfo.ini", mobase.FileTreeEntry.FILE)
-            if modinfo_entry:
-                try:
-                    paths = self._manager().extractFile(modinfo_entry, silent=True)
-                    properties = {}
-                    with open(paths, "r", encoding="utf-8") as f:
-                        for line in f:
-                            line = line.strip()
-                            if line and "=" in line:
-                                key, value = line.split("=", 1)
-                                key = key.strip().lower()
-                                value = value.strip()
-                                properties[key] = value
-                    return properties
-                except Exception as e:
-                    self._logger.error(f"读取modinfo.ini失败: {str(e)}")
+        def read_modinfo(paths: str) -> dict:
+            """读取已解压的modinfo配置文件"""
+            try:
+                with open(paths, "rb") as f:
+                    text = f.read().decode("utf-8", errors="replace")
+                return {key.lower(): value for key, value in _MODINFO_RE.findall(text)}
+            except Exception as e:
+                self._logger.error(f"读取modinfo.ini失败: {str(e)}")
             return {}
 
-        def find_preview(current_tree: mobase.IFileTree) -> Optional[QtGui.QPixmap]:
-            """查找预览图片"""
-            for entry in current_tree:
-                if entry.isFile() and entry.suffix().lower() in ["jpg", "jpeg", "png"]:
-                    try:
-                        paths = self._manager().extractFile(entry, silent=False)
-                        data = open(paths, "rb").read()
-                        if not data:
-                            continue
-                        pixmap = QtGui.QPixmap()
-                        if pixmap.loadFromData(data):
-                            return pixmap
-                    except Exception as e:
-                        self._logger.error(
-                            f"加载备用预览图失败 {entry.name()}: {str(e)}"
-                        )
-            return None
+        def read_modinfos(entries: List[mobase.FileTreeEntry]) -> List[dict]:
+            """通过一次批量解压读取多个modinfo配置文件"""
+            try:
+                paths = self._manager().extractFiles(entries, silent=True)
+            except Exception as e:
+                self._logger.error(f"读取modinfo.ini失败: {str(e)}")
+                return [{} for _ in entries]
+            return [read_modinfo(p) for p in paths]
 
         # 根目录检查
         entry = tree.find("modinfo.ini", mobase.FileTreeEntry.FILE)
         if entry:
-            preview = find_preview(tree)
-            modinfo_text = read_modinfo(tree)
+            preview = lambda: self._find_preview(tree)
+            modinfo_text = read_modinfos([entry])[0]
             return (tree, preview, modinfo_text)
 
         # 单文件夹检查
         if len(tree) == 1 and isinstance((root := tree[0]), mobase.IFileTree):
             return self._getWizardArchiveBase(root, data_name)
 
-        # 多选项处理
-        option_trees = []
+        # 多选项处理：先收集所有选项的modinfo.ini，再一次性解压
+        option_dirs = []
+        modinfo_entries = []
         for entry in tree:
             if entry.isDir():
                 modinfo_entry = entry.find("modinfo.ini", mobase.FileTreeEntry.FILE)
                 if modinfo_entry:
-                    preview = find_preview(entry)
-                    modinfo_text = read_modinfo(entry)
-                    option_trees.append((entry, preview, modinfo_text))
+                    option_dirs.append(entry)
+                    modinfo_entries.append(modinfo_entry)
+        if not option_dirs:
+            return None
+
+        return [
+            (entry, lambda e=entry: self._find_preview(e), modinfo_text)
+            for entry, modinfo_text in zip(option_dirs, read_modinfos(modinfo_entries))
+        ]
 
-        return option_trees if option_trees else None
+    def _get_archive_base(self, tree: mobase.IFileTree, data_name: str):
+        """获取压缩包解析结果，缓存最近一次结果供 isArchiveSupported 与 install 共用"""
+        if self._base_cache is not None and self._base_cache[0] is tree:
+            return self._base_cache[1]
+        base = self._getWizardArchiveBase(tree, data_name)
+        self._base_cache = (tree, base)
+        return base
+
+    def _find_preview(self, tree: mobase.IFileTree) -> Optional[QtGui.QPixmap]:
+        """查找预览图片，按目录缓存结果，同一安装过程中只解压解码一次"""
+        key = tree.path()
+        if key in self._preview_cache:
+            return self._preview_cache[key]
+        pixmap = None
+        for entry in tree:
+            if entry.isFile() and entry.suffix().lower() in _PREVIEW_EXTS:
+                try:
+                    paths = self._manager().extractFile(entry, silent=False)
+                    pixmap = self._load_preview_pixmap(paths)
+                    if pixmap is not None:
+                        break
+                except Exception as e:
+                    self._logger.error(f"加载备用预览图失败 {entry.name()}: {str(e)}")
+        self._preview_cache[key] = pixmap
+        return pixmap
+
+    @staticmethod
+    def _load_preview_pixmap(paths: str) -> Optional[QtGui.QPixmap]:
+        """解码预览图片，过大的图片在解码阶段按比例缩小"""
+        reader = QtGui.QImageReader(paths)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid() and max(size.width(), size.height()) > _PREVIEW_MAX_SIZE:
+            reader.setScaledSize(
+                size.scaled(
+                    _PREVIEW_MAX_SIZE,
+                    _PREVIEW_MAX_SIZE,
+                    QtCore.Qt.AspectRatioMode.KeepAspectRatio,
+                )
+            )
+        image = reader.read()
+        if image.isNull():
+            return None
+        # 转为绘制引擎最优的 32 位格式，避免每次绘制时再转换
+        image = image.convertToFormat(
+            QtGui.QImage.Format.Format_ARGB32_Premultiplied
+            if image.hasAlphaChannel()
+            else QtGui.QImage.Format.Format_RGB32
+        )
+        return QtGui.QPixmap.fromImage(image)
 
     def isArchiveSupported(self, tree: mobase.IFileTree) -> bool:
         """判断是否支持当前压缩包格式"""
         data_name = self._organizer.managedGame().dataDirectory().dirName()
-        base = self._getWizardArchiveBase(tree, data_name)
+        base = self._get_archive_base(tree, data_name)
         return base is not None
 
     def install(
@@ -502,7 +600,7 @@ class MhwsInstaller(mobase.IPluginInstallerSimple):
         self._initialize_current_mod(mod_name)
 
         data_name = self._organizer.managedGame().dataDirectory().dirName()
-        base = self._getWizardArchiveBase(tree, data_name)
+        base = self._get_archive_base(tree, data_name)
 
         if not base:
             return mobase.InstallResult.NOT_ATTEMPTED
@@ -535,8 +633,7 @@ class MhwsInstaller(mobase.IPluginInstallerSimple):
         self, tree: mobase.IFileTree, base: list
     ) -> Union[mobase.InstallResult, mobase.IFileTree]:
         """处理多选项安装"""
-        options_data = self._prepare_options_data(base)
-        groups, unique_name_map = self._group_options(options_data)
+        groups, unique_name_map = self._group_options(base)
         previous_selected = self._load_previous_selection()
 
         dialog = ModOptionsDialog(groups, self._parentWidget(), previous_selected)
@@ -546,40 +643,29 @@ class MhwsInstaller(mobase.IPluginInstallerSimple):
             )
         return mobase.InstallResult.CANCELED
 
-    def _prepare_options_data(self, base: list) -> list:
-        """准备选项显示数据"""
-        return [
-            {
-                "display_name": entry[2].get("name", entry[0].name()),
-                "preview": entry[1],
-                "modinfo": entry[2],
-                "entry": entry[0],
-            }
-            for entry in base
-        ]
-
-    def _group_options(self, options_data: list) -> tuple[list[GroupItem], dict]:
-        """分组处理安装选项"""
+    def _group_options(self, base: list) -> tuple[list[GroupItem], dict]:
+        """按 modinfo 中的分组名整理安装选项"""
         grouped_options = defaultdict(list)
         unique_name_map = {}
 
-        for data in options_data:
-            group_name = data["modinfo"].get("nameasbundle", "default")
-            unique_name = f"{group_name}:{data['display_name']}"
+        for entry, preview, modinfo in base:
+            display_name = modinfo["name"] if "name" in modinfo else entry.name()
+            group_name = modinfo.get("nameasbundle", "default")
+            unique_name = f"{group_name}:{display_name}"
             grouped_options[group_name].append(
                 GroupOption(
                     unique_name=unique_name,
-                    display_name=data["display_name"],
-                    description=data["modinfo"]
-                    .get("description", "无描述信息")
-                    .replace("\\n", "\n"),
-                    preview=data["preview"],
+                    display_name=display_name,
+                    description=modinfo.get("description", "无描述信息").replace(
+                        "\\n", "\n"
+                    ),
+                    preview=preview,
                 )
             )
-            unique_name_map[unique_name] = data["entry"]
+            unique_name_map[unique_name] = entry
 
-        for group_name, options in grouped_options.items():
-            grouped_options[group_name] = sorted(options, key=lambda x: x.display_name)
+        for options in grouped_options.values():
+            options.sort(key=attrgetter("display_name"))
 
         groups = [GroupItem(name=k, options=v) for k, v in grouped_options.items()]
         return groups, unique_name_map
@@ -604,12 +690,20 @@ class MhwsInstaller(mobase.IPluginInstallerSimple):
 
     def _clean_root_files(self, tree: mobase.IFileTree):
         """清理根目录临时文件"""
-        for entry in list(tree):
-            if entry.isFile() and entry.suffix().lower() in {"ini", "jpg", "png"}:
-                tree.remove(entry.name())
+        junk_names = [
+            entry.name()
+            for entry in tree
+            if entry.isFile() and entry.suffix().lower() in _JUNK_EXTS
+        ]
+        for name in junk_names:
+            tree.remove(name)
 
     def tr(self, value: str) -> str:
-        return QApplication.translate("MhwsInstaller", value)
+        text = self._tr_cache.get(value)
+        if text is None:
+            text = QApplication.translate("MhwsInstaller", value)
+            self._tr_cache[value] = text
+        return text
 
 
 def createPlugin() -> MhwsInstaller:
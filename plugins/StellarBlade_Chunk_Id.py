@@ -1,21 +1,63 @@
 import mobase
 import os
 import logging
-import uuid
+import mmap
+import random
+import re
 import struct
-from typing import List, Dict
+from typing import List, Dict, NamedTuple, Optional, Set, Tuple
 from PyQt6.QtGui import QIcon
 from PyQt6.QtWidgets import QMainWindow, QWidget, QMessageBox
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from ctypes import c_uint8, c_uint16, c_uint32, c_uint64
+from array import array
 
+_HEADER_S = struct.Struct("<16s BBH 9I Q 4I BBH I Q I I 5Q")
+_ENTRY_S = struct.Struct("<QHBB")
+_U64_S = struct.Struct("<Q")
+_OFFSET_LENGTH_S = struct.Struct(">QH")  # FIoOffsetAndLength: 5+5字节大端
+_U40_MASK = 0xFFFFFFFFFF
+_HEADER_SIZE = _HEADER_S.size  # 144
+_ENTRY_SIZE = _ENTRY_S.size  # 12
 
-@dataclass
+
+@dataclass(slots=True)
 class FGuid:
-    A: c_uint32 = field(default=c_uint32(0))
-    B: c_uint32 = field(default=c_uint32(0))
-    C: c_uint32 = field(default=c_uint32(0))
-    D: c_uint32 = field(default=c_uint32(0))
+    A: int = 0
+    B: int = 0
+    C: int = 0
+    D: int = 0
+
+
+class TocHeader(NamedTuple):
+    magic: bytes  # 16s
+    version: int  # B
+    reserved0: int  # B
+    reserved00: int  # H
+    TocHeaderSize: int  # I
+    TocEntryCount: int
+    TocCompressedBlockEntryCount: int
+    TocCompressedBlockEntrySize: int
+    CompressionMethodNameCount: int
+    CompressionMethodNameLength: int
+    CompressionBlockSize: int
+    DirectoryIndexSize: int
+    PartitionCount: int
+    FIoContainerId: int  # Q
+    EncryptionKeyGuid: FGuid  # 4I
+    ContainerFlags: int  # B
+    Reserved1: int  # B
+    Reserved2: int  # H
+    TocChunkPerfectHashSeedsCount: int  # I
+    PartitionSize: int  # Q
+    TocChunksWithoutPerfectHashCount: int  # I
+    Reserved3: int  # I
+    Reserved4: int  # Q
+    Reserved5: int
+    Reserved6: int
+    Reserved7: int
+    Reserved8: int
 
 
 @dataclass
@@ -23,7 +65,7 @@ class Container:
     name: str
     container_id: int = 0
     old_container_id: int = 0
-    package_ids: List[int] = field(default_factory=list)
+    package_ids: array = field(default_factory=lambda: array("Q"))
 
 
 class UTOCParser:
@@ -32,233 +74,250 @@ class UTOCParser:
     def __init__(self, logger):
         self._logger = logger
         self.reset_parser_state()
-        self.container_ids = []
-        self.package_ids: Dict[int, list] = {}
-        self.containers: Dict[str, Container] = {}
+        self.container_ids: Set[int] = set()
+        self.package_ids: Dict[int, Set[str]] = defaultdict(set)
         self.Force = False
+        # 为True时ucas写入先记录，由 flush_ucas_writes 统一并发执行
+        self.defer_ucas_writes = False
+        self.pending_ucas_writes = []
 
     def reset_parser_state(self):
         """重置解析器状态，为解析新文件做准备"""
         self.header = None
-        self.offset_lengths = []
-        self.compressed_blocks = []
-        self.directory_index = b""
-        self.entry_metas = []
-        self.file_size = 0
         self.container = None
 
-    def generate_u64_id(self, ids: List[c_uint64]) -> c_uint64:
+    def generate_u64_id(self, ids: Set[int]) -> int:
         """生成一个新的64位无符号整数ID"""
         for _ in range(10):
-            candidate = uuid.uuid4().int & 0xFFFFFFFFFFFFFFFF
+            candidate = random.getrandbits(64)
             if candidate not in ids:
-                ids.append(c_uint64(candidate))
+                ids.add(candidate)
                 # candidate=0
-                return c_uint64(candidate)
+                return candidate
         raise ValueError("无法生成唯一的64位无符号整数ID")
 
-    def find_and_replace_bytes(self, file_path, mappingId: Dict[int, int]):
+    def find_and_replace_bytes(self, file_path, mappingId: Dict[int, int], data=None):
         """
-        在文件中搜索指定字节序列并替换，覆盖原文件
+        在文件中搜索指定字节序列并原地替换
         :param file_path: 文件路径
+        :param data: 已可写映射的文件内容，为None时自行打开并映射文件
         """
+        # 无待替换ID时不打开文件，空正则会在每个位置都匹配
+        if not mappingId:
+            self._logger.info("未找到匹配字节序列")
+            return
+        if data is None:
+            with open(file_path, "r+b") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_WRITE
+            ) as data:
+                return self.find_and_replace_bytes(file_path, mappingId, data)
+
         replacements = 0
-        with open(file_path, "rb") as f:
-            data = bytearray(f.read())
-        for old, new in mappingId.items():
-            search_bytes = old.to_bytes(8, "little")
-            replace_bytes = new.to_bytes(8, "little")
-            # 查找并替换所有匹配项
-            offset = 0
-
-            while offset < len(data):
-                found = data.find(search_bytes, offset)
-                if found == -1:
-                    break
-                data[found : found + len(search_bytes)] = replace_bytes
-                replacements += 1
-                offset = found + len(search_bytes)
-
-            # 覆盖原文件
+        replace_map = {
+            old.to_bytes(8, "little"): new.to_bytes(8, "little")
+            for old, new in mappingId.items()
+        }
+        # 所有待替换ID合并为一个正则，单次扫描完成全部匹配并原地替换
+        pattern = re.compile(b"|".join(map(re.escape, replace_map)))
+        for match in pattern.finditer(data):
+            data[match.start() : match.end()] = replace_map[match.group()]
+            replacements += 1
+
         if replacements > 0:
-            with open(file_path, "wb") as f:
-                f.write(data)
-            print(f"成功替换 {replacements} 处匹配项")
+            self._logger.info("成功替换 %d 处匹配项", replacements)
         else:
-            print("未找到匹配字节序列")
+            self._logger.info("未找到匹配字节序列")
 
-    def _parse_header(self, data, utoc_f) -> Dict[int, int]:
+    def _parse_header(self, data) -> Dict[int, int]:
         """解析utoc文件头"""
-        header_format = "<16s BBH 9I Q 4I BBH I Q I I 5Q"
-        header_size = struct.calcsize(header_format)
-        header_data = struct.unpack(header_format, data[:header_size])
-        encryption_guid = FGuid(
-            A=c_uint32(header_data[14]),
-            B=c_uint32(header_data[15]),
-            C=c_uint32(header_data[16]),
-            D=c_uint32(header_data[17]),
+        header_data = _HEADER_S.unpack_from(data, 0)
+        encryption_guid = FGuid(*header_data[14:18])
+        self.header = TocHeader._make(
+            header_data[:14] + (encryption_guid,) + header_data[18:]
         )
-        self.header = {
-            "magic": header_data[0],  # 16s
-            "version": header_data[1],  # B
-            "reserved0": header_data[2],  # B
-            "reserved00": header_data[3],  # H
-            "TocHeaderSize": header_data[4],  # I
-            "TocEntryCount": header_data[5],
-            "TocCompressedBlockEntryCount": header_data[6],
-            "TocCompressedBlockEntrySize": header_data[7],
-            "CompressionMethodNameCount": header_data[8],
-            "CompressionMethodNameLength": header_data[9],
-            "CompressionBlockSize": header_data[10],
-            "DirectoryIndexSize": header_data[11],
-            "PartitionCount": header_data[12],
-            "FIoContainerId": header_data[13],  # Q
-            "EncryptionKeyGuid": encryption_guid,  # 4I
-            "ContainerFlags": header_data[18],  # B
-            "Reserved1": header_data[19],  # B
-            "Reserved2": header_data[20],  # Q
-            "TocChunkPerfectHashSeedsCount": header_data[21],  # I
-            "PartitionSize": header_data[22],  # Q
-            "TocChunksWithoutPerfectHashCount": header_data[23],  # I
-            "Reserved3": header_data[24],  # I
-            "Reserved4": header_data[25],  # Q
-            "Reserved5": header_data[26],
-            "Reserved6": header_data[27],
-            "Reserved7": header_data[28],
-            "Reserved8": header_data[29],
-        }
 
         # 验证魔数
-        if self.header["magic"] != self.EXPECTED_MAGIC:
+        if self.header.magic != self.EXPECTED_MAGIC:
             raise ValueError(
                 f"无效的魔数: {self.header.magic.hex()}, 期望: {self.EXPECTED_MAGIC.hex()}"
             )
         # 如果已存在，则创建id
-        if self.header["FIoContainerId"] in self.container_ids or self.Force:
-            newContainerId = self.generate_u64_id(self.container_ids).value
-            # 写入新id
-            utoc_f.seek(56)
-            utoc_f.write(struct.pack("<Q", newContainerId))
-
-            # 记录id
-            self.container.old_container_id = self.header["FIoContainerId"]
+        if self.header.FIoContainerId in self.container_ids or self.Force:
+            newContainerId = self.generate_u64_id(self.container_ids)
+
+            # 记录id，写入由 _patch_container_id 完成
+            self.container.old_container_id = self.header.FIoContainerId
             self.container.container_id = newContainerId
 
-            return {self.header["FIoContainerId"]: newContainerId}
+            return {self.header.FIoContainerId: newContainerId}
         else:
-            self.container_ids.append(self.header["FIoContainerId"])
-            self.container.container_id = self.header["FIoContainerId"]
+            self.container_ids.add(self.header.FIoContainerId)
+            self.container.container_id = self.header.FIoContainerId
             return None
 
-    def _parse_package_ids(self, data):
+    def _find_container_entry(
+        self, data, toc_entry_count: int, container_id: int
+    ) -> int:
+        """在TocEntry区域中查找container id条目的索引，未找到返回-1"""
+        toc_entry_start = _HEADER_SIZE
+        toc_entry_end = toc_entry_start + toc_entry_count * _ENTRY_SIZE
+        search_bytes = _U64_S.pack(container_id)
+        found = data.find(search_bytes, toc_entry_start, toc_entry_end)
+        while found != -1:
+            index, misaligned = divmod(found - toc_entry_start, _ENTRY_SIZE)
+            # ChunkType 10 为 ContainerHeader
+            if not misaligned and data[found + _ENTRY_SIZE - 1] == 10:
+                return index
+            found = data.find(search_bytes, found + 1, toc_entry_end)
+        return -1
+
+    def _parse_package_ids(self, data, offset: int = _HEADER_SIZE):
         """解析utoc文件中的package ids"""
-        PackageId_format = "<QHBB"
-        PackageId_size = struct.calcsize(PackageId_format)
-        for i in range(self.header["TocEntryCount"]):
-            PackageId = struct.unpack(PackageId_format, data[:PackageId_size])
-            ChunkId = PackageId[0]
-            ChunkType = PackageId[3]
-            data = data[PackageId_size:]
-            self.container.package_ids.append(ChunkId)
-            if ChunkId not in self.package_ids:
-                self.package_ids[ChunkId] = []
-            if self.container.name not in self.package_ids[ChunkId]:
-                self.package_ids[ChunkId].append(self.container.name)
+        # 每个条目为8字节ChunkId加4字节其余字段，一次调用解包全部ChunkId
+        chunk_ids = struct.unpack_from(
+            "<" + "Q4x" * self.header.TocEntryCount, data, offset
+        )
+        self.container.package_ids.extend(chunk_ids)
+        name = self.container.name
+        for ChunkId in chunk_ids:
+            self.package_ids[ChunkId].add(name)
         return None
 
-    def parse_utoc(self, utoc_file: str):
-        """解析单个utoc文件"""
+    def _patch_container_id(self, file_data, base_name: str, ucas_file: str) -> bool:
+        """将新的container ID写入utoc及对应ucas，未找到条目返回False"""
+        toc_entry_count = self.header.TocEntryCount
+        compression_block_size = self.header.CompressionBlockSize
+        old_container_id = self.container.old_container_id
+        container_id = self.container.container_id
+        toc_entry_start = _HEADER_SIZE
+        entry_size = _ENTRY_SIZE
+
+        # 搜索匹配的ID条目
+        index = self._find_container_entry(file_data, toc_entry_count, old_container_id)
+        if index == -1:
+            self._logger.error("未找到container_id %s", base_name)
+            return False
+
+        # 写入新id到header
+        _U64_S.pack_into(file_data, 56, container_id)
+
+        # 更新UTOC中的container ID
+        _U64_S.pack_into(
+            file_data,
+            toc_entry_start + index * entry_size,
+            container_id,
+        )
+
+        # 计算数据块位置
+        toc_chunk_start = toc_entry_start + toc_entry_count * entry_size
+        chunk_entry_pos = toc_chunk_start + index * 10
+
+        # 读取数据块信息: offset/length 均为5字节大端，一次读出10字节后按位拆分
+        high, low = _OFFSET_LENGTH_S.unpack_from(file_data, chunk_entry_pos)
+        offset_val = high >> 24
+        length_val = (high & 0xFFFFFF) << 16 | low
+
+        # 计算压缩块索引
+        first_block_idx = offset_val // compression_block_size
+        last_block_idx = (
+            offset_val + length_val + compression_block_size - 1
+        ) // compression_block_size - 1
+
+        # 获取压缩块信息
+        compression_block_start = toc_chunk_start + toc_entry_count * 10
+        block_entry_pos = compression_block_start + first_block_idx * 12
+        block_offset = _U64_S.unpack_from(file_data, block_entry_pos)[0] & _U40_MASK
+
+        # 更新UCAS文件的container_id
+        ucas_write = (ucas_file, block_offset, old_container_id, container_id)
+        if self.defer_ucas_writes:
+            self.pending_ucas_writes.append(ucas_write)
+        else:
+            self._write_ucas_container_id(*ucas_write)
+        return True
+
+    def _write_ucas_container_id(
+        self,
+        ucas_file: str,
+        block_offset: int,
+        old_container_id: int,
+        container_id: int,
+    ):
+        """将新的container ID写入ucas文件"""
+        with open(ucas_file, "r+b") as ucas_f, mmap.mmap(
+            ucas_f.fileno(), 0, access=mmap.ACCESS_WRITE
+        ) as ucas_data:
+            self._logger.debug("更新ucas容器ID: %d", container_id)
+            # container ID 与utoc中一致为小端序
+            read_container_id = _U64_S.unpack_from(ucas_data, block_offset)[0]
+            if read_container_id == old_container_id:
+                _U64_S.pack_into(ucas_data, block_offset, container_id)
+            # 在同一映射中替换其余位置的旧ID，无需重新打开文件
+            self.find_and_replace_bytes(
+                ucas_file,
+                {old_container_id: container_id},
+                ucas_data,
+            )
+
+    def flush_ucas_writes(self):
+        """并发执行所有延迟的ucas写入"""
+        pending, self.pending_ucas_writes = self.pending_ucas_writes, []
+        if not pending:
+            return
+        # 每个ucas只对应一个utoc，各写入互不重叠
+        with ThreadPoolExecutor(max_workers=min(32, len(pending))) as executor:
+            list(executor.map(self._write_ucas_container_id, *zip(*pending)))
+
+    def parse_utoc(self, utoc_file: str, file_data=None):
+        """
+        解析单个utoc文件
+        :param utoc_file: utoc文件路径
+        :param file_data: 预先读取的文件内容(至少包含header及TocEntry区域)，为None时只读映射文件
+        """
         self.reset_parser_state()
-        base_name = os.path.basename(utoc_file)
-        if not base_name.endswith(".utoc"):
+        if not utoc_file.endswith(".utoc"):
             return None, self.package_ids
 
-        ucas_file = utoc_file.replace(".utoc", ".ucas")
-        self._logger.debug(f"开始解析文件: {base_name}")
-        self.container = Container(base_name.split(".")[0])
+        # 未预读时以只读方式映射，避免整文件复制到内存
+        if file_data is None:
+            with open(utoc_file, "rb") as utoc_f, mmap.mmap(
+                utoc_f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped_data:
+                return self.parse_utoc(utoc_file, mapped_data)
 
-        with open(utoc_file, "r+b") as utoc_f:
-            file_data = utoc_f.read()
-            self.file_size = len(file_data)
-
-            # 解析header
-            changed_container_id = self._parse_header(file_data, utoc_f)
-            toc_entry_count = self.header["TocEntryCount"]
-            compression_block_size = self.header["CompressionBlockSize"]
-
-            # 处理需要修改container ID的情况
-            if changed_container_id:
-                found = False
-                toc_entry_start = 144
-                entry_size = 12
-
-                # 搜索匹配的ID条目
-                for index in range(toc_entry_count):
-                    entry_pos = toc_entry_start + index * entry_size
-                    id_bytes = file_data[entry_pos : entry_pos + entry_size]
-                    id_val, reverse1, reverse2, idtype = struct.unpack(
-                        "<QHBB", id_bytes
-                    )
-
-                    if id_val == self.container.old_container_id and idtype == 10:
-                        # 更新UTOC中的container ID
-                        utoc_f.seek(entry_pos)
-                        utoc_f.write(struct.pack("<Q", self.container.container_id))
-                        found = True
-                        break
-
-                if not found:
-                    self._logger.error(f"未找到container_id {base_name}")
-                    return None, self.package_ids
-
-                # 计算数据块位置
-                toc_chunk_start = toc_entry_start + toc_entry_count * entry_size
-                chunk_entry_pos = toc_chunk_start + index * 10
-
-                # 读取数据块信息
-                offset_bytes = file_data[chunk_entry_pos : chunk_entry_pos + 5]
-                length_bytes = file_data[chunk_entry_pos + 5 : chunk_entry_pos + 10]
-                offset_val = int.from_bytes(offset_bytes, byteorder="big")
-                length_val = int.from_bytes(length_bytes, byteorder="big")
-
-                # 计算压缩块索引
-                first_block_idx = offset_val // compression_block_size
-                last_block_idx = (
-                    offset_val + length_val + compression_block_size - 1
-                ) // compression_block_size - 1
-
-                # 获取压缩块信息
-                compression_block_start = toc_chunk_start + toc_entry_count * 10
-                block_entry_pos = compression_block_start + first_block_idx * 12
-                block_offset = int.from_bytes(
-                    file_data[block_entry_pos : block_entry_pos + 5], "little"
-                )
+        base_name = os.path.basename(utoc_file)
+        ucas_file = utoc_file[: -len(".utoc")] + ".ucas"
+        self._logger.debug("开始解析文件: %s", base_name)
+        self.container = Container(base_name.split(".")[0])
 
-                # 更新UCAS文件的container_id
-                with open(ucas_file, "r+b") as ucas_f:
-                    self._logger.debug(f"更新ucas容器ID: {self.container.container_id}")
-                    ucas_data = ucas_f.read()
-                    read_container_id = int.from_bytes(
-                        ucas_data[block_offset : block_offset + 8]
-                    )
-                    if read_container_id == self.container.old_container_id:
-                        ucas_f.seek(block_offset)
-                        ucas_f.write(struct.pack("<Q", self.container.container_id))
-                self.find_and_replace_bytes(
-                    ucas_file,
-                    {self.container.old_container_id: self.container.container_id},
-                )
+        # 只读解析，仅在需要修改container ID时才以写方式映射文件
+        # 解析header
+        changed_container_id = self._parse_header(file_data)
 
+        # 处理需要修改container ID的情况
+        if changed_container_id:
+            with open(utoc_file, "r+b") as utoc_f, mmap.mmap(
+                utoc_f.fileno(), 0, access=mmap.ACCESS_WRITE
+            ) as mapped_data:
+                if not self._patch_container_id(mapped_data, base_name, ucas_file):
+                    return None, self.package_ids
+                # 解析package IDs
+                self._parse_package_ids(mapped_data)
+        else:
             # 解析package IDs
-            self._parse_package_ids(file_data[144:])
+            self._parse_package_ids(file_data)
 
         # 处理结果返回
         if changed_container_id or self.Force:
-            msg = f"{self.container.name} {self.container.old_container_id}->{self.container.container_id}"
-            self._logger.debug(f"处理完成: {msg}")
+            self._logger.debug(
+                "处理完成: %s %d->%d",
+                self.container.name,
+                self.container.old_container_id,
+                self.container.container_id,
+            )
             return self.container, self.package_ids
 
-        self._logger.debug(f"无需处理: {base_name}")
+        self._logger.debug("无需处理: %s", base_name)
         return None, self.package_ids
 
 
@@ -272,6 +331,8 @@ class StellarBlade_Chunk_Id_Patcher(mobase.IPluginTool):
         self._init_logger()
         self.ucas_files = []
         self.num = 0
+        # utoc路径 -> ((mtime_ns, size, ino), 文件头及TocEntry区域)，重复运行时跳过未变化文件的读取
+        self._utoc_cache: Dict[str, Tuple[Tuple[int, int, int], bytes]] = {}
 
     def _init_logger(self) -> None:
         """初始化日志记录器"""
@@ -321,37 +382,96 @@ class StellarBlade_Chunk_Id_Patcher(mobase.IPluginTool):
             return False
         self.game_path = self._IPluginGame.gameDirectory().path()
 
+    def _scan_mod_utocs(self) -> List[Tuple[str, Set[str]]]:
+        """按优先级倒序列出各激活mod的~mods目录及其中的utoc文件名(小写)"""
+        modList = self._organizer.modList()
+        mod_utocs = []
+        for mod in reversed(modList.allModsByProfilePriority()):
+            if not modList.state(mod) & mobase.ModState.ACTIVE:
+                continue
+            mod_utoc_dir = os.path.join(self.mod_parent, mod, "SB/Content/Paks/~mods")
+            try:
+                with os.scandir(mod_utoc_dir) as it:
+                    names = {
+                        name
+                        for name in (e.name.lower() for e in it)
+                        if name.endswith(".utoc")
+                    }
+            except OSError:
+                continue
+            if names:
+                mod_utocs.append((mod_utoc_dir, names))
+        return mod_utocs
+
     def _collect_UcasFiles(self, entry: mobase.IFileTree):
         """收集所有Ucas文件"""
+        # 每个mod只列一次目录，避免对 mod × utoc 的每种组合都stat
+        mod_utocs = self._scan_mod_utocs()
         for file in list(entry):
             if file.hasSuffix("utoc"):
                 baseName = file.name().rsplit(".", 1)[0]
-                allMods = self._organizer.modList().allModsByProfilePriority()
-                for mod in reversed(allMods):
-                    mod_state = self._organizer.modList().state(mod)
-                    if mod_state & mobase.ModState.ACTIVE:
-                        mod_dir = os.path.join(self.mod_parent, mod)
-                        utoc_path = os.path.join(
-                            mod_dir, "SB/Content/Paks/~mods/" + baseName + ".utoc"
-                        )
-                        if os.path.exists(utoc_path):
-                            self.ucas_files.append(utoc_path)
-        self._logger.debug(f"找到 {len(self.ucas_files)} 个 utoc")
+                utoc_name = baseName + ".utoc"
+                key = utoc_name.lower()
+                for mod_utoc_dir, names in mod_utocs:
+                    if key in names:
+                        self.ucas_files.append(os.path.join(mod_utoc_dir, utoc_name))
+        self._logger.debug("找到 %d 个 utoc", len(self.ucas_files))
+
+    def _read_utoc(self, utoc_file: str) -> Optional[bytes]:
+        """只读取utoc文件头及TocEntry区域，失败时返回None交由解析时处理"""
+        try:
+            st = os.stat(utoc_file)
+            key = (st.st_mtime_ns, st.st_size, st.st_ino)
+            cached = self._utoc_cache.get(utoc_file)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            with open(utoc_file, "rb") as f:
+                data = f.read(_HEADER_SIZE)
+                complete = False
+                if len(data) == _HEADER_SIZE:
+                    # 无冲突时仅需解析package ids，其余区域由写入路径按需映射
+                    toc_entry_count = _HEADER_S.unpack(data)[5]
+                    data += f.read(toc_entry_count * _ENTRY_SIZE)
+                    complete = len(data) == _HEADER_SIZE + toc_entry_count * _ENTRY_SIZE
+        except OSError:
+            return None
+        # 文件被截断时不缓存，下次重新读取
+        if complete:
+            self._utoc_cache[utoc_file] = (key, data)
+        return data
 
     def deprase_utoc(self, ucas_files: list):
         """解析utoc文件"""
         parser = UTOCParser(self._logger)
+        parser.defer_ucas_writes = True
         containers = {}
-        for file in ucas_files:
-            container, packageids = parser.parse_utoc(file)
-            if container:
-                containers[container.name] = container
+        # 丢弃已停用或已删除mod的缓存
+        current_files = set(ucas_files)
+        self._utoc_cache = {
+            path: cached
+            for path, cached in self._utoc_cache.items()
+            if path in current_files
+        }
+        if not ucas_files:
+            return
+        # 并发预读所有utoc，解析与ID分配仍按顺序进行
+        with ThreadPoolExecutor(max_workers=min(32, len(ucas_files))) as executor:
+            file_datas = executor.map(self._read_utoc, ucas_files)
+            for file, file_data in zip(ucas_files, file_datas):
+                container, packageids = parser.parse_utoc(file, file_data)
+                if container:
+                    containers[container.name] = container
+                    # 文件已被修改，不依赖mtime精度，直接使缓存失效
+                    self._utoc_cache.pop(file, None)
+        parser.flush_ucas_writes()
         for k, v in containers.items():
             self.num = self.num + 1
-            self._logger.info(f"{k}:{v.old_container_id}->{v.container_id}")
-        for k, v in packageids.items():
+            self._logger.info("%s:%d->%d", k, v.old_container_id, v.container_id)
+        for k, v in parser.package_ids.items():
             if len(v) > 1:
-                self._logger.warning(f"警告！修改相同资源 packageid = {k} :\n{v}")
+                self._logger.warning(
+                    "警告！修改相同资源 packageid = %d :\n%s", k, sorted(v)
+                )
 
     def display(self):
         """主显示逻辑"""
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import re
 import logging
-from collections import defaultdict
-from typing import Dict, List, Optional, Union
+from collections import defaultdict, deque
+from typing import Callable, Iterator, List, Optional, Union
 import os
 from dataclasses import dataclass
+from operator import attrgetter
 
 from PyQt6 import QtWidgets, QtGui, QtCore
 from PyQt6.QtCore import QDir
@@ -13,6 +13,24 @@ from PyQt6.QtWidgets import QApplication
 
 import mobase
 
+# 预览图缓存上限(KB)，QPixmapCache 默认仅10MB，放不下一张高分辨率预览图
+_PREVIEW_CACHE_LIMIT_KB = 256 * 1024
+# 选项切换后刷新预览的延迟(ms)，按住方向键连续切换时只刷新最后一项
+_PREVIEW_DEBOUNCE_MS = 80
+# 预览图最长边上限(像素)，超过时解码阶段按比例缩小
+_PREVIEW_MAX_SIZE = 2048
+# 可作为预览图的文件后缀
+_PREVIEW_EXTS = frozenset({"jpg", "jpeg", "png"})
+# 游戏文件后缀 -> 安装目标目录
+_SUFFIX_DEST = {
+    "pak": "SB/Content/Paks/~mods/",
+    "ucas": "SB/Content/Paks/~mods/",
+    "utoc": "SB/Content/Paks/~mods/",
+    "bk2": "SB/Content/Movies/",
+}
+# 选项按显示名称排序的键
+_BY_DISPLAY_NAME = attrgetter("display_name")
+
 
 @dataclass
 class GroupOption:
@@ -21,7 +39,8 @@ class GroupOption:
     unique_name: str
     display_name: str
     description: str
-    preview: Optional[QtGui.QPixmap] = None
+    # 预览图路径，或首次显示时才解压并返回路径的函数
+    preview_path: Union[str, Callable[[], Iterator[str]], None] = None
 
 
 @dataclass
@@ -50,22 +69,25 @@ class ModOptionsDialog(QtWidgets.QDialog):
         super().__init__(parent)
         self._selected_options: list[str] = []
         self.groups = groups
-        self.preselect = preselect or []
+        self.preselect = frozenset(preselect or ())
         self.current_group_index = 0
 
-        # 创建选项映射关系
+        # 创建选项映射关系，预览图只记录路径，显示时再解码
         self.preview_map = {}
         self.modinfo_map = {}
         for group in groups:
             for option in group.options:
-                self.preview_map[option.unique_name] = option.preview
+                self.preview_map[option.unique_name] = option.preview_path
                 self.modinfo_map[option.unique_name] = option.description
+        self._preview_cache_keys: set[str] = set()
 
         self.setup_ui()
 
     def setup_ui(self):
         """初始化用户界面布局"""
         self.setWindowTitle(self.tr("Select Options"))
+        if QtGui.QPixmapCache.cacheLimit() < _PREVIEW_CACHE_LIMIT_KB:
+            QtGui.QPixmapCache.setCacheLimit(_PREVIEW_CACHE_LIMIT_KB)
         splitter = QtWidgets.QSplitter(QtCore.Qt.Orientation.Horizontal, self)
 
         self._setup_graphics_view(splitter)
@@ -92,16 +114,16 @@ class ModOptionsDialog(QtWidgets.QDialog):
     def find_first_leaf(
         self, tree: QtWidgets.QTreeWidget
     ) -> Optional[QtWidgets.QTreeWidgetItem]:
-        """查找树中的第一个叶子节点"""
+        """查找树中的第一个叶子节点（广度优先，优先返回层级最浅的叶子）"""
         root = tree.invisibleRootItem()
-        stack = [root]
-        while stack:
-            item = stack.pop(0)
+        queue = deque([root])
+        while queue:
+            item = queue.popleft()
             for i in range(item.childCount()):
                 child = item.child(i)
                 if child.childCount() == 0:  # 叶子节点
                     return child
-                stack.append(child)
+                queue.append(child)
         return None
 
     def _setup_graphics_view(self, splitter: QtWidgets.QSplitter):
@@ -124,11 +146,39 @@ class ModOptionsDialog(QtWidgets.QDialog):
         self.graphics_view.setHorizontalScrollBarPolicy(
             QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff
         )
+        # 场景中只有一张图片或一行文字，按需局部重绘且无需保存画笔状态
+        self.graphics_view.setViewportUpdateMode(
+            QtWidgets.QGraphicsView.ViewportUpdateMode.SmartViewportUpdate
+        )
+        self.graphics_view.setOptimizationFlags(
+            QtWidgets.QGraphicsView.OptimizationFlag.DontSavePainterState
+            | QtWidgets.QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing
+        )
         self.graphics_view.viewport().setCursor(QtCore.Qt.CursorShape.OpenHandCursor)
         self.graphics_view.viewport().installEventFilter(self)
 
         self.scene = QtWidgets.QGraphicsScene()
         self.graphics_view.setScene(self.scene)
+
+        # 预览图与提示文字各只创建一次，切换选项时只替换图片或切换可见性
+        self._pixmap_item = QtWidgets.QGraphicsPixmapItem()
+        self._pixmap_item.setTransformationMode(
+            QtCore.Qt.TransformationMode.SmoothTransformation
+        )
+        # 缓存当前缩放下的渲染结果，拖动时直接贴图而非重新平滑缩放
+        self._pixmap_item.setCacheMode(
+            QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache
+        )
+        self._pixmap_item.setVisible(False)
+        self.scene.addItem(self._pixmap_item)
+
+        self._no_preview_item = self.scene.addText(self.tr("无可用预览"))
+        self._no_preview_item.setDefaultTextColor(QtGui.QColor("#FFFFFF"))
+        self._no_preview_item.setPos(
+            -self._no_preview_item.boundingRect().width() / 2,
+            -self._no_preview_item.boundingRect().height() / 2,
+        )
+        self._no_preview_item.setVisible(False)
         self.graphics_view.setStyleSheet("border: 1px solid #444; background: #2A2A2A;")
         self.graphics_view.setMinimumSize(600, 600)
         splitter.addWidget(self.graphics_view)
@@ -153,6 +203,11 @@ class ModOptionsDialog(QtWidgets.QDialog):
         self.stacked_widget = QtWidgets.QStackedWidget()
         layout.addWidget(self.stacked_widget, stretch=6)
 
+        self._preview_timer = QtCore.QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(_PREVIEW_DEBOUNCE_MS)
+        self._preview_timer.timeout.connect(self.update_preview)
+
         self.tree_widgets = []
         for group in self.groups:
             page_widget = QtWidgets.QWidget()
@@ -160,30 +215,34 @@ class ModOptionsDialog(QtWidgets.QDialog):
 
             tree_widget = QtWidgets.QTreeWidget()
             tree_widget.setHeaderHidden(True)  # 隐藏表头
+            tree_widget.setUniformRowHeights(True)
             tree_widget.setSelectionMode(
                 QtWidgets.QAbstractItemView.SelectionMode.SingleSelection
             )
 
             # 构建树形结构
             root = tree_widget.invisibleRootItem()
-            path_nodes = {}  # 存储路径节点
+            # 存储路径节点，键为 (父节点键, 名称)，顶层父节点键为None
+            # 以嵌套元组代替逐级拼接的路径字符串
+            path_nodes = {}
+            # 按父节点键收集子节点，最后每个父节点一次性 addChildren
+            children = defaultdict(list)
 
             # 先按路径排序，确保父节点先创建
-            sorted_options = sorted(group.options, key=lambda opt: opt.display_name)
+            sorted_options = sorted(group.options, key=_BY_DISPLAY_NAME)
 
             for option in sorted_options:
                 parts = option.display_name.split("/")
-                current_path = ""
-                current_parent = root
+                parent_key = None
 
                 # 构建路径节点
                 for i, part in enumerate(parts):
-                    current_path = current_path + "/" + part if current_path else part
+                    key = (parent_key, part)
 
-                    if current_path not in path_nodes:
+                    if key not in path_nodes:
                         node = QtWidgets.QTreeWidgetItem([part])
-                        path_nodes[current_path] = node
-                        current_parent.addChild(node)
+                        path_nodes[key] = node
+                        children[parent_key].append(node)
                         # 只有叶子节点才可选中
                         if i == len(parts) - 1:
                             node.setData(
@@ -200,13 +259,14 @@ class ModOptionsDialog(QtWidgets.QDialog):
                                     else QtCore.Qt.CheckState.Unchecked
                                 ),
                             )
-                    else:
-                        node = path_nodes[current_path]
+                    parent_key = key
 
-                    current_parent = node
+            for parent_key, nodes in children.items():
+                parent = root if parent_key is None else path_nodes[parent_key]
+                parent.addChildren(nodes)
 
             tree_widget.collapseAll()
-            tree_widget.itemSelectionChanged.connect(self.update_preview)
+            tree_widget.itemSelectionChanged.connect(self._preview_timer.start)
             self.tree_widgets.append(tree_widget)
             page_layout.addWidget(tree_widget)
             self.stacked_widget.addWidget(page_widget)
@@ -260,7 +320,7 @@ class ModOptionsDialog(QtWidgets.QDialog):
             view_rect = self.graphics_view.mapToScene(
                 self.graphics_view.viewport().rect()
             ).boundingRect()
-            image_rect = self.scene.itemsBoundingRect()
+            image_rect = self._shown_preview_rect()
             if view_rect.contains(image_rect):
                 self.graphics_view.centerOn(image_rect.center())
 
@@ -336,56 +396,103 @@ class ModOptionsDialog(QtWidgets.QDialog):
         if not unique_name:  # 非叶子节点没有数据
             return
 
-        self.scene.clear()
-        preview = self.preview_map.get(unique_name)
+        preview = self._load_preview(unique_name)
         if preview:
-            pixmap_item = QtWidgets.QGraphicsPixmapItem(preview)
-            pixmap_item.setTransformationMode(
-                QtCore.Qt.TransformationMode.SmoothTransformation
-            )
-            pixmap_item.setPos(-preview.width() / 2, -preview.height() / 2)
-            self.scene.addItem(pixmap_item)
+            self._pixmap_item.setPixmap(preview)
+            self._pixmap_item.setPos(-preview.width() / 2, -preview.height() / 2)
+            self._pixmap_item.setVisible(True)
+            self._no_preview_item.setVisible(False)
             self.graphics_view.fitInView(
-                pixmap_item, QtCore.Qt.AspectRatioMode.KeepAspectRatio
+                self._pixmap_item, QtCore.Qt.AspectRatioMode.KeepAspectRatio
             )
         else:
-            text_item = self.scene.addText(self.tr("无可用预览"))
-            text_item.setDefaultTextColor(QtGui.QColor("#FFFFFF"))
-            text_item.setPos(
-                -text_item.boundingRect().width() / 2,
-                -text_item.boundingRect().height() / 2,
-            )
+            # 释放上一张预览图，避免隐藏的图片项继续占用内存
+            self._pixmap_item.setPixmap(QtGui.QPixmap())
+            self._pixmap_item.setVisible(False)
+            self._no_preview_item.setVisible(True)
 
         self.modinfo_text.setPlainText(
             self.modinfo_map.get(unique_name, self.tr("无modinfo信息"))
         )
 
+    def _load_preview(self, unique_name: str) -> Optional[QtGui.QPixmap]:
+        """从QPixmapCache获取预览图，未命中时从文件解码并放入缓存"""
+        # 键带上对话框标识，避免不同压缩包中同名选项互相命中
+        key = f"SB_Installer/{id(self)}/{unique_name}"
+        pixmap = QtGui.QPixmapCache.find(key)
+        if pixmap is not None:
+            return pixmap
+        source = self.preview_map.get(unique_name)
+        # 首次选中时才逐个解压候选图，无法解码时回退到下一张
+        candidates = source() if callable(source) else (source,)
+        for path in candidates:
+            if path and (pixmap := self._read_preview(path)) is not None:
+                # 记住可用的路径，缓存被淘汰后无需重新解压
+                self.preview_map[unique_name] = path
+                QtGui.QPixmapCache.insert(key, pixmap)
+                self._preview_cache_keys.add(key)
+                return pixmap
+        self.preview_map[unique_name] = None
+        return None
+
+    @staticmethod
+    def _read_preview(path: str) -> Optional[QtGui.QPixmap]:
+        """解码预览图，超过上限的图片在解码阶段按比例缩小"""
+        reader = QtGui.QImageReader(path)
+        size = reader.size()
+        if size.isValid() and max(size.width(), size.height()) > _PREVIEW_MAX_SIZE:
+            reader.setScaledSize(
+                size.scaled(
+                    _PREVIEW_MAX_SIZE,
+                    _PREVIEW_MAX_SIZE,
+                    QtCore.Qt.AspectRatioMode.KeepAspectRatio,
+                )
+            )
+        image = reader.read()
+        if image.isNull():
+            return None
+        return QtGui.QPixmap.fromImage(image)
+
+    def done(self, result: int):
+        """关闭对话框时释放本对话框写入的预览图缓存"""
+        # 停止尚未触发的预览刷新，避免关闭后再向缓存写入预览图
+        self._preview_timer.stop()
+        for key in self._preview_cache_keys:
+            QtGui.QPixmapCache.remove(key)
+        self._preview_cache_keys.clear()
+        super().done(result)
+
     def resizeEvent(self, event: QtGui.QResizeEvent):
         """窗口大小变化事件处理"""
         super().resizeEvent(event)
-        if self.scene.items():
+        image_rect = self._shown_preview_rect()
+        if not image_rect.isNull():
             self.graphics_view.fitInView(
-                self.scene.itemsBoundingRect(),
-                QtCore.Qt.AspectRatioMode.KeepAspectRatio,
+                image_rect, QtCore.Qt.AspectRatioMode.KeepAspectRatio
             )
 
+    def _shown_preview_rect(self) -> QtCore.QRectF:
+        """当前显示的预览图或提示文字在场景中的范围，均未显示时为空矩形"""
+        for item in (self._pixmap_item, self._no_preview_item):
+            if item.isVisible():
+                return item.sceneBoundingRect()
+        return QtCore.QRectF()
+
     def selected_options(self) -> list[str]:
         """获取所有选中的选项唯一名称"""
+        # 由Qt迭代器直接筛选已勾选的叶子节点
+        flags = (
+            QtWidgets.QTreeWidgetItemIterator.IteratorFlag.Checked
+            | QtWidgets.QTreeWidgetItemIterator.IteratorFlag.NoChildren
+        )
         selected = []
         for tree_widget in self.tree_widgets:
-            root = tree_widget.invisibleRootItem()
-            stack = [root]
-            while stack:
-                parent = stack.pop()
-                for i in range(parent.childCount()):
-                    child = parent.child(i)
-                    if child.childCount() > 0:  # 非叶子节点，继续遍历
-                        stack.append(child)
-                    else:  # 叶子节点，检查是否选中
-                        if child.checkState(0) == QtCore.Qt.CheckState.Checked:
-                            unique_name = child.data(0, QtCore.Qt.ItemDataRole.UserRole)
-                            if unique_name:
-                                selected.append(unique_name)
+            it = QtWidgets.QTreeWidgetItemIterator(tree_widget, flags)
+            while item := it.value():
+                unique_name = item.data(0, QtCore.Qt.ItemDataRole.UserRole)
+                if unique_name:
+                    selected.append(unique_name)
+                it += 1
         return selected
 
     def tr(self, value: str) -> str:
@@ -396,18 +503,13 @@ class ModOptionsDialog(QtWidgets.QDialog):
 class SB_Installer(mobase.IPluginInstallerSimple):
     """MOD安装器核心类，实现MO2插件接口"""
 
-    RE_DESCRIPTION = re.compile(r"select([0-9]+)-description")
-    RE_OPTION = re.compile(r"select([0-9]+)-option([0-9]+)")
-
-    _installerOptions: Dict[str, List[str]]
-    _installerUsed: bool
-
     def __init__(self):
         super().__init__()
         self._init_logger()
         self.current_mod = None
         self.new_mod = None
         self._pending_selected_options = None
+        self._base_cache: Optional[tuple[mobase.IFileTree, object]] = None
 
     def _init_logger(self) -> None:
         """初始化日志记录器"""
@@ -437,11 +539,13 @@ class SB_Installer(mobase.IPluginInstallerSimple):
         game_name = os.path.basename(executable)
         if game_name == "SB.exe" or game_name == "SB-Win64-Shipping.exe":
             self._logger.debug("Stellar Blade detected")
-            allMods = self._organizer.modList().allModsByProfilePriority()
+            mod_list = self._organizer.modList()
+            allMods = mod_list.allModsByProfilePriority()
             mod_parent = self._organizer.modsPath()
+            active = mobase.ModState.ACTIVE.value
             Logic = False
             for mod in allMods:
-                mod_state = self._organizer.modList().state(mod)
+                mod_state = mod_list.state(mod)
                 self._logger.debug(f"{mod} : {mod_state}")
                 if mod.startswith("LogicModsStart"):
                     Logic = True
@@ -450,15 +554,22 @@ class SB_Installer(mobase.IPluginInstallerSimple):
                 if mod.startswith("LogicModsEnd"):
                     self._logger.info(f"find: {mod}")
                     break
-                if Logic and mod_state & mobase.ModState.ACTIVE.value:
+                if Logic and mod_state & active:
                     self._logger.debug(f"process mod: {mod}")
-                    mod_path = os.path.join(mod_parent, f"{mod}/SB/Content/Paks/~mods")
-                    new_mod_path = os.path.join(
-                        mod_parent, f"{mod}/SB/Content/Paks/LogicMods"
-                    )
-                    if os.path.exists(mod_path):
-                        self._logger.info(f"rename {mod_path} to {new_mod_path}")
-                        os.rename(mod_path, new_mod_path)
+                    paks_path = os.path.join(mod_parent, mod, "SB", "Content", "Paks")
+                    mod_path = os.path.join(paks_path, "~mods")
+                    new_mod_path = os.path.join(paks_path, "LogicMods")
+                    # 直接重命名，由系统调用判断源目录是否存在，省去一次 exists 检查
+                    try:
+                        os.replace(mod_path, new_mod_path)
+                    except FileNotFoundError:
+                        continue
+                    except OSError as e:
+                        self._logger.warning(
+                            f"rename {mod_path} to {new_mod_path} failed: {e}"
+                        )
+                        continue
+                    self._logger.info(f"rename {mod_path} to {new_mod_path}")
             return True
         else:
             self._logger.debug("Not Stellar Blade")
@@ -503,8 +614,7 @@ class SB_Installer(mobase.IPluginInstallerSimple):
         current_mod: Optional[mobase.IModInterface],
     ):
         """安装开始时的回调方法"""
-        self._installerUsed = False
-        self._installerOptions = {}
+        self._base_cache = None
         self.current_mod = current_mod
 
     def onInstallationEnd(
@@ -512,6 +622,7 @@ class SB_Installer(mobase.IPluginInstallerSimple):
     ):
         """安装结束时的回调方法"""
         self.new_mod = new_mod
+        self._base_cache = None
         if (
             result == mobase.InstallResult.SUCCESS
             and self._pending_selected_options is not None
@@ -525,102 +636,79 @@ class SB_Installer(mobase.IPluginInstallerSimple):
             )
             self._pending_selected_options = None
 
-        if (
-            result != mobase.InstallResult.SUCCESS
-            or not self._installerUsed
-            or not new_mod
-        ):
-            return
-
-        new_mod.clearPluginSettings(self.name())
-        for i, desc in enumerate(self._installerOptions):
-            new_mod.setPluginSetting(self.name(), f"select{i}-description", desc)
-            for iopt, opt in enumerate(self._installerOptions[desc]):
-                new_mod.setPluginSetting(self.name(), f"select{i}-option{iopt}", opt)
-
     def _getWizardArchiveBase(self, tree: mobase.IFileTree, data_name: str) -> Union[
-        tuple[mobase.IFileTree, Optional[QtGui.QPixmap], dict],
-        List[tuple[mobase.IFileTree, Optional[QtGui.QPixmap], dict]],
+        tuple[mobase.IFileTree, Callable[[], Iterator[str]], dict],
+        List[tuple[mobase.IFileTree, Callable[[], Iterator[str]], dict]],
         None,
     ]:
         """解析压缩包结构并获取有效选项数据"""
 
-        def find_preview(current_tree: mobase.IFileTree) -> Optional[QtGui.QPixmap]:
-            for entry in list(current_tree):
-                if (
-                    entry.isFile()
-                    and entry.name().lower().startswith("preview")
-                    and entry.suffix().lower() in ["jpg", "jpeg", "png"]
-                ):
-                    try:
-                        paths = self._manager().extractFile(entry, silent=False)
-                        data = open(paths, "rb").read()
-                        if not data:
-                            continue
-                        pixmap = QtGui.QPixmap()
-                        if pixmap.loadFromData(data):
-                            return pixmap
-                    except Exception as e:
-                        self._logger.error(
-                            f"加载备用预览图失败 {entry.name()}: {str(e)}"
-                        )
-            return None
-
-        def has_game_files(folder: mobase.IFileTree) -> bool:
-            for entry in list(folder):
-                if entry.isDir():
-                    self._logger.debug(f"跳过目录: {entry.name()}")
-                    continue
-                if (
-                    entry.hasSuffix("pak")
-                    or entry.hasSuffix("ucas")
-                    or entry.hasSuffix("utoc")
-                    or entry.hasSuffix("bk2")
-                ):
-                    self._logger.debug(f"找到游戏文件: {entry.name()}")
-                    return True
-                elif entry.hasSuffix("png") and entry.name().lower() != "preview.png":
-                    self._logger.debug(f"找到PNG文件: {entry.name()}, 认为是Images文件")
-                    return True
-                elif entry.hasSuffix("bmp") and entry.name().startswith("Splash"):
-                    self._logger.debug(
-                        f"找到特殊的Splash图片: {entry.name()}, 认为是Splash文件"
-                    )
-                    return True
-                elif (
-                    entry.isDir() and entry.name().startswith("ue4ss")
-                ) or entry.name() == "dwmapi.dll":
-                    self._logger.debug(
-                        f"找到UE4SS相关文件夹或DLL: {entry.name()}, 认为是UE4SS文件"
-                    )
-                    return True
-                else:
-                    self._logger.debug(f"忽略未知文件: {entry.name()}")
+        def find_preview(candidates: list[mobase.FileTreeEntry]) -> Iterator[str]:
+            """按顺序解压预览图并逐个返回路径，由对话框在首次显示该选项时解码"""
+            for entry in candidates:
+                try:
+                    paths = self._manager().extractFile(entry, silent=False)
+                    if paths and os.path.getsize(paths) > 0:
+                        yield paths
+                except Exception as e:
+                    self._logger.error(f"加载备用预览图失败 {entry.name()}: {str(e)}")
+
+        def is_game_file(name: str, lname: str, suffix: str) -> bool:
+            if suffix in _SUFFIX_DEST:
+                self._logger.debug(f"找到游戏文件: {name}")
+                return True
+            elif suffix == "png" and lname != "preview.png":
+                self._logger.debug(f"找到PNG文件: {name}, 认为是Images文件")
+                return True
+            elif suffix == "bmp" and name.startswith("Splash"):
+                self._logger.debug(f"找到特殊的Splash图片: {name}, 认为是Splash文件")
+                return True
+            elif name == "dwmapi.dll":
+                self._logger.debug(f"找到UE4SS相关文件夹或DLL: {name}, 认为是UE4SS文件")
+                return True
+            self._logger.debug(f"忽略未知文件: {name}")
             return False
 
         def find_options(
             root_tree: mobase.IFileTree,
             current_tree: mobase.IFileTree,
             rel_path: str = "",
-        ) -> List[tuple[mobase.IFileTree, Optional[QtGui.QPixmap], dict]]:
+        ) -> List[tuple[mobase.IFileTree, Callable[[], Iterator[str]], dict]]:
             """递归查找所有包含游戏文件的文件夹选项"""
             options = []
             current_path = (
                 f"{rel_path}/{current_tree.name()}" if rel_path else current_tree.name()
             )
 
+            # 一次遍历完成分类：子文件夹、游戏文件、预览图候选
+            subdirs = []
+            preview_files = []
+            has_game_files = False
+            for entry in current_tree:
+                if entry.isDir():
+                    subdirs.append(entry)
+                    continue
+                # 每个条目只取一次名称和后缀，减少 Python/C++ 往返
+                name = entry.name()
+                lname = name.lower()
+                suffix = entry.suffix().lower()
+                if lname.startswith("preview") and suffix in _PREVIEW_EXTS:
+                    preview_files.append(entry)
+                if not has_game_files:
+                    has_game_files = is_game_file(name, lname, suffix)
+
             # 检查当前文件夹是否包含游戏文件
-            if has_game_files(current_tree):
-                preview = find_preview(current_tree)
+            if has_game_files:
+                # 预览图延迟到选中时再解压，isArchiveSupported 不再触发解压
+                preview = lambda files=preview_files: find_preview(files)
                 folder_info = {"name": current_path, "description": current_path}
-                self._logger.debug(f"找到有效选项: {current_path}, 预览图: {preview}")
+                self._logger.debug(f"找到有效选项: {current_path}")
                 options.append((current_tree, preview, folder_info))
 
             # 递归检查所有子文件夹
-            for entry in list(current_tree):
-                if entry.isDir():
-                    # 递归时使用当前树的根节点（root_tree）来保持原始结构
-                    options.extend(find_options(root_tree, entry, current_path))
+            for entry in subdirs:
+                # 递归时使用当前树的根节点（root_tree）来保持原始结构
+                options.extend(find_options(root_tree, entry, current_path))
 
             return options
 
@@ -636,6 +724,14 @@ class SB_Installer(mobase.IPluginInstallerSimple):
             self._logger.debug(f"找到 {len(options)} 个选项")
             return options
 
+    def _get_archive_base(self, tree: mobase.IFileTree, data_name: str):
+        """获取压缩包解析结果，缓存最近一次结果供 isArchiveSupported 与 install 共用"""
+        if self._base_cache is not None and self._base_cache[0] is tree:
+            return self._base_cache[1]
+        base = self._getWizardArchiveBase(tree, data_name)
+        self._base_cache = (tree, base)
+        return base
+
     def isArchiveSupported(self, tree: mobase.IFileTree) -> bool:
         """判断是否支持当前压缩包格式"""
         data_name = self._organizer.managedGame().dataDirectory().dirName()
@@ -645,7 +741,7 @@ class SB_Installer(mobase.IPluginInstallerSimple):
         )
         if game_name == "Stellar Blade":
             self._logger.debug("当前游戏是Stellar Blade")
-            base = self._getWizardArchiveBase(tree, data_name)
+            base = self._get_archive_base(tree, data_name)
             return base is not None
         return
 
@@ -662,7 +758,7 @@ class SB_Installer(mobase.IPluginInstallerSimple):
         self._initialize_current_mod(mod_name)
 
         data_name = self._organizer.managedGame().dataDirectory().dirName()
-        base = self._getWizardArchiveBase(tree, data_name)
+        base = self._get_archive_base(tree, data_name)
 
         if not base:
             return mobase.InstallResult.NOT_ATTEMPTED
@@ -684,26 +780,19 @@ class SB_Installer(mobase.IPluginInstallerSimple):
     def _wrap_in_target_path(self, tree: mobase.IFileTree) -> mobase.IFileTree:
         """将文件树包装到目标路径 SB/PAK/~MODS/ 下"""
         for entry in list(tree):
-            if (
-                entry.hasSuffix("pak")
-                or entry.hasSuffix("ucas")
-                or entry.hasSuffix("utoc")
-            ):
-                tree.move(entry, "SB/Content/Paks/~mods/")
-            elif entry.hasSuffix("bk2"):
-                tree.move(entry, "SB/Content/Movies/")
-            elif entry.hasSuffix("png") and not entry.name().lower().startswith(
-                "preview"
-            ):
+            name = entry.name()
+            suffix = entry.suffix().lower()
+            dest = _SUFFIX_DEST.get(suffix)
+            if dest:
+                tree.move(entry, dest)
+            elif suffix == "png" and not name.lower().startswith("preview"):
                 tree.move(entry, "SB/Content/Images/SaveImage/")
-            elif entry.name().startswith("Splash") and entry.hasSuffix("bmp"):
+            elif suffix == "bmp" and name.startswith("Splash"):
                 tree.move(entry, "SB/Content/Splash/")
-            elif (
-                entry.isDir() and entry.name().startswith("ue4ss")
-            ) or entry.name() == "dwmapi.dll":
+            elif (entry.isDir() and name.startswith("ue4ss")) or name == "dwmapi.dll":
                 tree.move(entry, "SB/Binaries/Win64/")
             else:
-                self._logger.error("未知文件类型，无法处理: " + entry.name())
+                self._logger.error("未知文件类型，无法处理: " + name)
         return tree
 
     def _handle_single_option(
@@ -762,13 +851,13 @@ class SB_Installer(mobase.IPluginInstallerSimple):
                     description=data["modinfo"]
                     .get("description", "无描述信息")
                     .replace("\\n", "\n"),
-                    preview=data["preview"],
+                    preview_path=data["preview"],
                 )
             )
             unique_name_map[unique_name] = data["entry"]
 
-        for group_name, options in grouped_options.items():
-            grouped_options[group_name] = sorted(options, key=lambda x: x.display_name)
+        for options in grouped_options.values():
+            options.sort(key=_BY_DISPLAY_NAME)
 
         groups = [GroupItem(name=k, options=v) for k, v in grouped_options.items()]
         return groups, unique_name_map